@@ -2,19 +2,51 @@
 Executor Agent
 Executes steps from the plan and calls appropriate tools
 """
+import os
+import re
+import copy
+import json
 import time
-from typing import Dict, Any, List
+import random
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
+from pydantic import ValidationError
+from agents.planner import PlanStep
 from tools import get_registry
 
 
+logger = logging.getLogger("executor")
+
+
+# References to prior step outputs inside parameter values, e.g.
+# "{{step_1.result}}" or "use step 2's repositories"
+_STEP_REF_RE = re.compile(r"step[_\s](\d+)", re.IGNORECASE)
+
+
 class ExecutorAgent:
     """
     Executor Agent executes the planned steps
     Calls tools with appropriate parameters and handles errors
     """
-    
+
+    # Maximum number of cached tool results before LRU eviction
+    TOOL_CACHE_MAX_ENTRIES = 512
+
     def __init__(self):
         self.tool_registry = get_registry()
+        # Bounded TTL LRU cache for tool results: key -> (timestamp, result)
+        self._tool_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tool_cache_lock = threading.Lock()
+        self._tool_cache_ttl = float(os.getenv("TOOL_CACHE_TTL", "300"))
+        # Retry backoff tuning (capped exponential with full jitter)
+        self._retry_base_delay = float(os.getenv("RETRY_BASE_DELAY", "0.25"))
+        self._retry_max_backoff = float(os.getenv("RETRY_MAX_BACKOFF", "30"))
+        # In-flight tool calls for single-flight coalescing: key -> Future
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
     
     def execute_plan(self, plan: Dict[str, Any], max_retries: int = 2) -> Dict[str, Any]:
         """
@@ -35,35 +67,29 @@ class ExecutorAgent:
                 "results": []
             }
         
-        steps = plan.get("steps", [])
-        results = []
-        
-        for step in steps:
-            step_number = step.get("step_number", 0)
-            tool_name = step.get("tool")
-            action = step.get("action")
-            parameters = step.get("parameters", {})
-            
-            print(f"\n[Executor] Executing Step {step_number}: {action}")
-            print(f"[Executor] Tool: {tool_name}")
-            print(f"[Executor] Parameters: {parameters}")
-            
-            # Execute step with retries
-            step_result = self._execute_step_with_retry(
-                step_number=step_number,
-                tool_name=tool_name,
-                action=action,
-                parameters=parameters,
-                max_retries=max_retries
-            )
-            
-            results.append(step_result)
-            
-            # If step failed critically, stop execution
-            if not step_result.get("success") and not step_result.get("partial_success"):
-                print(f"[Executor] Step {step_number} failed critically, stopping execution")
-                break
-        
+        # Validate once into typed steps; attribute access in the hot path
+        # is cheaper than repeated dict.get chains and surfaces missing
+        # fields here instead of masking them with defaults
+        try:
+            steps = [
+                step if isinstance(step, PlanStep) else PlanStep.model_validate(step)
+                for step in plan.get("steps", [])
+            ]
+        except ValidationError as e:
+            return {
+                "status": "error",
+                "error": f"Plan steps failed validation: {e}",
+                "results": []
+            }
+
+        max_workers = int(os.getenv("TOOL_CONCURRENCY_LIMIT", "4"))
+
+        if max_workers <= 1 or len(steps) <= 1:
+            results = self._execute_sequential(steps, max_retries)
+        else:
+            dependencies = self._infer_dependencies(steps)
+            results = self._execute_parallel(steps, max_retries, max_workers, dependencies)
+
         return {
             "status": "success",
             "task": plan.get("task"),
@@ -71,7 +97,143 @@ class ExecutorAgent:
             "executed_steps": len(results),
             "results": results
         }
-    
+
+    def _execute_sequential(
+        self,
+        steps: List[PlanStep],
+        max_retries: int
+    ) -> List[Dict[str, Any]]:
+        """Execute steps one at a time in plan order"""
+        results = []
+
+        for step in steps:
+            step_result = self._run_step(step, max_retries)
+            results.append(step_result)
+
+            # If step failed critically, stop execution
+            if not step_result.get("success") and not step_result.get("partial_success"):
+                logger.error("Step %s failed critically, stopping execution", step_result.get("step_number"))
+                break
+
+        return results
+
+    def _infer_dependencies(self, steps: List[PlanStep]) -> Dict[int, set]:
+        """
+        Build the dependency map for a plan
+
+        Unions each step's declared 'depends_on' list with step numbers
+        referenced inside its parameter values (e.g. "{{step_1.result}}"),
+        so steps that consume an earlier step's output are never scheduled
+        ahead of it even when the planner forgot to declare the edge.
+
+        Args:
+            steps: Plan steps
+
+        Returns:
+            Mapping of step_number -> set of prerequisite step numbers
+        """
+        step_numbers = {step.step_number for step in steps}
+        dependencies: Dict[int, set] = {}
+
+        for step in steps:
+            deps = set(step.depends_on)
+            try:
+                blob = json.dumps(step.parameters, default=str)
+            except (TypeError, ValueError):
+                blob = ""
+            referenced = {int(number) for number in _STEP_REF_RE.findall(blob)}
+            dependencies[step.step_number] = (deps | (referenced & step_numbers)) - {step.step_number}
+
+        return dependencies
+
+    def _execute_parallel(
+        self,
+        steps: List[PlanStep],
+        max_retries: int,
+        max_workers: int,
+        dependencies: Dict[int, set]
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute independent steps concurrently
+
+        Steps are scheduled in topological waves: all steps whose
+        dependencies (declared or inferred from parameter references) have
+        completed run together in a thread pool, so independent I/O-bound
+        tool calls overlap instead of running back to back.
+
+        Args:
+            steps: Plan steps
+            max_retries: Maximum retries per step
+            max_workers: Thread pool size
+            dependencies: Prerequisite map from _infer_dependencies
+
+        Returns:
+            List of step results in step order
+        """
+        results: List[Dict[str, Any]] = []
+        remaining = list(steps)
+        completed: set = set()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while remaining:
+                # Steps whose dependencies have all completed form the next wave
+                ready = [
+                    step for step in remaining
+                    if all(dep in completed for dep in dependencies[step.step_number])
+                ]
+                if not ready:
+                    # Unresolvable dependencies (cycle or reference to a
+                    # skipped step) - fall back to running what's left in order
+                    logger.warning("Could not resolve step dependencies, running remaining steps together")
+                    ready = list(remaining)
+
+                futures = {
+                    pool.submit(self._run_step, step, max_retries): step
+                    for step in ready
+                }
+
+                wave_results: Dict[int, Dict[str, Any]] = {}
+                critical_failure = False
+
+                for future in as_completed(futures):
+                    step = futures[future]
+                    step_result = future.result()
+                    wave_results[id(step)] = step_result
+
+                    if not step_result.get("success") and not step_result.get("partial_success"):
+                        logger.error("Step %s failed critically, stopping execution", step_result.get("step_number"))
+                        critical_failure = True
+
+                # Collect wave results in plan order
+                for step in ready:
+                    results.append(wave_results[id(step)])
+                    completed.add(step.step_number)
+                    remaining.remove(step)
+
+                if critical_failure:
+                    break
+
+        return results
+
+    def _run_step(self, step: PlanStep, max_retries: int) -> Dict[str, Any]:
+        """Execute a single plan step"""
+        step_number = step.step_number
+        tool_name = step.tool
+        action = step.action
+        parameters = step.parameters
+
+        logger.info("Executing step %s: %s [tool=%s]", step_number, action, tool_name)
+        # Parameter dumps can be large - only format them when DEBUG is on
+        logger.debug("Step %s parameters: %s", step_number, parameters)
+
+        return self._execute_step_with_retry(
+            step_number=step_number,
+            tool_name=tool_name,
+            action=action,
+            parameters=parameters,
+            max_retries=max_retries
+        )
+
     def _execute_step_with_retry(
         self,
         step_number: int,
@@ -82,24 +244,43 @@ class ExecutorAgent:
     ) -> Dict[str, Any]:
         """
         Execute a single step with retry logic
-        
+
         Args:
             step_number: Step number
             tool_name: Name of tool to use
             action: Description of action
             parameters: Tool parameters
             max_retries: Maximum number of retries
-            
+
         Returns:
             Step execution result
         """
         last_error = None
-        
+
+        # Serve repeated identical tool calls from the cache, skipping
+        # both the remote call and the retry loop
+        cache_key = self._tool_cache_key(tool_name, parameters)
+        if cache_key is not None:
+            cached_result = self._tool_cache_get(cache_key)
+            if cached_result is not None:
+                logger.info("Step %s served from tool cache", step_number)
+                return {
+                    "step_number": step_number,
+                    "action": action,
+                    "tool": tool_name,
+                    "parameters": parameters,
+                    "success": True,
+                    "result": cached_result
+                }
+
+        retry_after = None
+
         for attempt in range(max_retries + 1):
             try:
                 if attempt > 0:
-                    print(f"[Executor] Retry {attempt}/{max_retries} for step {step_number}")
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    logger.warning("Retry %s/%s for step %s", attempt, max_retries, step_number)
+                    time.sleep(self._backoff_delay(attempt, retry_after))
+                    retry_after = None
                 
                 # Handle "none" tool (informational steps)
                 if tool_name == "none":
@@ -115,11 +296,13 @@ class ExecutorAgent:
                 
                 # Get and execute tool
                 tool = self.tool_registry.get_tool(tool_name)
-                result = tool.execute(**parameters)
+                result = self._call_tool_coalesced(tool, cache_key, parameters)
                 
                 # Check if execution was successful
                 if result.get("success"):
-                    print(f"[Executor] Step {step_number} completed successfully")
+                    logger.info("Step %s completed successfully", step_number)
+                    if cache_key is not None and getattr(tool, "cacheable", False):
+                        self._tool_cache_store(cache_key, result)
                     return {
                         "step_number": step_number,
                         "action": action,
@@ -130,7 +313,17 @@ class ExecutorAgent:
                     }
                 else:
                     last_error = result.get("error", "Unknown error")
-                    print(f"[Executor] Step {step_number} failed: {last_error}")
+                    logger.warning("Step %s failed: %s", step_number, last_error)
+
+                    # Honor upstream throttling hints on the next backoff
+                    retry_after = result.get("retry_after_seconds")
+
+                    # Client errors other than rate limiting won't succeed
+                    # on retry - stop attempting
+                    status_code = result.get("status_code")
+                    if status_code and 400 <= status_code < 500 and status_code != 429:
+                        logger.warning("Step %s failed with non-retryable status %s", step_number, status_code)
+                        break
                     
             except ValueError as e:
                 # Tool not found - critical error, don't retry
@@ -145,7 +338,7 @@ class ExecutorAgent:
                 
             except Exception as e:
                 last_error = str(e)
-                print(f"[Executor] Step {step_number} error: {last_error}")
+                logger.warning("Step %s error: %s", step_number, last_error)
         
         # All retries failed
         return {
@@ -158,6 +351,119 @@ class ExecutorAgent:
             "error": f"Failed after {max_retries} retries: {last_error}"
         }
     
+    def _call_tool_coalesced(
+        self,
+        tool,
+        cache_key: Optional[str],
+        parameters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Execute a tool call, coalescing identical concurrent calls
+
+        If another thread is already executing the same call (same cache
+        key), wait for its result instead of issuing a duplicate upstream
+        request - the cache only helps after the first call returns, this
+        closes the window while it is still in flight.
+
+        Args:
+            tool: Tool instance to execute
+            cache_key: Cache key identifying the call (None disables coalescing)
+            parameters: Tool parameters
+
+        Returns:
+            Tool result dictionary
+        """
+        if cache_key is None or not getattr(tool, "cacheable", False):
+            return tool.execute(**parameters)
+
+        with self._inflight_lock:
+            future = self._inflight.get(cache_key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[cache_key] = future
+
+        if not leader:
+            # Followers share the leader's result (copied so callers
+            # can't mutate each other's data)
+            return copy.deepcopy(future.result())
+
+        try:
+            result = tool.execute(**parameters)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute the retry delay for an attempt
+
+        Uses capped exponential backoff with full jitter so parallel steps
+        retrying against the same failing upstream don't stampede it in
+        lockstep.
+
+        Args:
+            attempt: Retry attempt number (1-based)
+            retry_after: Upstream-requested minimum delay, if any
+
+        Returns:
+            Delay in seconds
+        """
+        cap = min(self._retry_max_backoff, self._retry_base_delay * (2 ** (attempt - 1)))
+        delay = random.uniform(0, cap)
+        if retry_after:
+            delay = max(delay, float(retry_after))
+        return delay
+
+    def _tool_cache_key(self, tool_name: str, parameters: Dict[str, Any]) -> Optional[str]:
+        """
+        Build the cache key for a tool call (None if caching doesn't apply)
+
+        Args:
+            tool_name: Name of tool
+            parameters: Tool parameters
+
+        Returns:
+            Cache key string, or None when caching is disabled or the
+            step has no real tool
+        """
+        if tool_name == "none" or self._tool_cache_ttl <= 0:
+            return None
+        try:
+            return f"{tool_name}|{json.dumps(parameters, sort_keys=True, default=str)}"
+        except (TypeError, ValueError):
+            return None
+
+    def _tool_cache_get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Get a fresh cached result for the key, or None on miss/expiry"""
+        with self._tool_cache_lock:
+            entry = self._tool_cache.get(cache_key)
+            if entry is None:
+                return None
+
+            timestamp, result = entry
+            if time.time() - timestamp >= self._tool_cache_ttl:
+                del self._tool_cache[cache_key]
+                return None
+
+            self._tool_cache.move_to_end(cache_key)
+            cached = copy.deepcopy(result)
+            cached["cache_hit"] = True
+            return cached
+
+    def _tool_cache_store(self, cache_key: str, result: Dict[str, Any]) -> None:
+        """Store a successful tool result, evicting the LRU entry on overflow"""
+        with self._tool_cache_lock:
+            self._tool_cache[cache_key] = (time.time(), copy.deepcopy(result))
+            self._tool_cache.move_to_end(cache_key)
+            while len(self._tool_cache) > self.TOOL_CACHE_MAX_ENTRIES:
+                self._tool_cache.popitem(last=False)
+
     def get_execution_summary(self, execution_result: Dict[str, Any]) -> str:
         """
         Get human-readable summary of execution
@@ -2,36 +2,46 @@
 Planner Agent
 Converts natural language input into structured execution plan
 """
-from typing import Dict, Any, List
+import os
+import re
+import copy
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import Dict, Any, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from embedding import embed
 from llm import get_llm_client
 from tools import get_registry
 
 
-class PlannerAgent:
-    """
-    Planner Agent converts user requests into step-by-step execution plans
-    Uses LLM to analyze task and select appropriate tools
-    """
-    
-    def __init__(self):
-        self.llm = get_llm_client()
-        self.tool_registry = get_registry()
-    
-    def create_plan(self, user_input: str) -> Dict[str, Any]:
-        """
-        Create execution plan from user input
-        
-        Args:
-            user_input: Natural language task description
-            
-        Returns:
-            Dictionary containing the execution plan with steps
-        """
-        # Get available tools description
-        tools_description = self.tool_registry.get_tools_description()
-        
-        # Create system instruction
-        system_instruction = """You are a task planning agent. Your job is to analyze user requests and create detailed execution plans.
+# Tool names inside a (possibly incomplete) streamed plan JSON
+_TOOL_FIELD_RE = re.compile(r'"tool"\s*:\s*"([^"]+)"')
+
+
+class PlanStep(BaseModel):
+    """Schema for a single plan step"""
+    # Frozen so steps are immutable and hashable once validated
+    model_config = ConfigDict(frozen=True)
+
+    step_number: int
+    action: str
+    tool: str
+    parameters: Dict[str, Any]
+    depends_on: List[int] = Field(default_factory=list)
+
+
+class Plan(BaseModel):
+    """Schema for a planner output"""
+    task: str
+    steps: List[PlanStep]
+
+
+# Static planner system instruction - built once so the identical prefix
+# can be cached provider-side across calls
+PLANNER_SYSTEM_TEMPLATE = """You are a task planning agent. Your job is to analyze user requests and create detailed execution plans.
 
 You have access to these tools:
 {tools}
@@ -47,7 +57,8 @@ Your output must be valid JSON with this exact structure:
             "parameters": {{
                 "param1": "value1",
                 "param2": "value2"
-            }}
+            }},
+            "depends_on": []
         }}
     ]
 }}
@@ -59,35 +70,187 @@ Guidelines:
 4. Be specific with parameter values
 5. Steps should be ordered logically
 6. If a task doesn't need any tools, create a step with tool "none"
-""".format(tools=tools_description)
-        
-        # Create prompt
-        prompt = f"""Analyze this user request and create an execution plan:
+7. "depends_on" lists step_numbers whose results a step needs; leave it empty for independent steps so they can run in parallel
+"""
 
-User Request: {user_input}
 
-Create a detailed step-by-step plan to accomplish this task. Consider:
-- What information needs to be gathered?
-- Which tools are needed?
-- What order makes sense?
-- What parameters are required?
+class PlanCache:
+    """
+    Cache for planner outputs keyed by user input
+
+    Provides two lookup paths:
+    1. Exact match: hash of normalized user input -> plan
+    2. Semantic match: embedding similarity against previously cached plans
+       (requires sentence-transformers and numpy; silently disabled otherwise)
+    """
+
+    # Bound on each index so a long-lived process doesn't accumulate a
+    # plan template (plus embedding vector) per distinct request forever
+    MAX_ENTRIES = 256
+
+    def __init__(self, similarity_threshold: float = 0.90):
+        """
+        Initialize the plan cache
+
+        Args:
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.similarity_threshold = similarity_threshold
+        # Locked because the shared PlannerAgent serves concurrent
+        # requests from the API's worker threads
+        self._lock = threading.Lock()
+        self._exact: OrderedDict = OrderedDict()
+        self._entries: List[Any] = []  # list of (embedding, plan_template) pairs
+
+    @staticmethod
+    def _normalize(user_input: str) -> str:
+        """Normalize user input for exact-match hashing"""
+        return hashlib.sha256(user_input.strip().lower().encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _embed(text: str):
+        """Embed text via the shared model (None if unavailable)"""
+        vectors = embed([text])
+        return vectors[0] if vectors is not None else None
+
+    def get_exact(self, user_input: str) -> Optional[Dict[str, Any]]:
+        """Get cached plan for an exact (normalized) input match"""
+        key = self._normalize(user_input)
+        with self._lock:
+            plan = self._exact.get(key)
+            if plan is None:
+                return None
+            self._exact.move_to_end(key)
+            return copy.deepcopy(plan)
+
+    def get_similar(self, user_input: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached plan template for a semantically similar input
+
+        Args:
+            user_input: Natural language task description
+
+        Returns:
+            Cached plan template if similarity >= threshold, else None
+        """
+        # Snapshot under the lock; the matmul runs on the copy so a
+        # concurrent store can't mutate the list mid-np.stack
+        with self._lock:
+            entries = list(self._entries)
+        if not entries:
+            return None
+
+        query = self._embed(user_input)
+        if query is None:
+            return None
+
+        import numpy as np
+        # Single matmul against stacked (N, D) matrix of cached embeddings
+        matrix = np.stack([embedding for embedding, _ in entries])
+        similarities = matrix @ query
+        best = int(np.argmax(similarities))
+
+        if similarities[best] >= self.similarity_threshold:
+            return copy.deepcopy(entries[best][1])
+        return None
+
+    def store(self, user_input: str, plan: Dict[str, Any]) -> None:
+        """Store a validated plan, evicting the oldest entries on overflow"""
+        template = copy.deepcopy(plan)
+        key = self._normalize(user_input)
+        # Embed outside the lock - it may load a model on first use
+        embedding = self._embed(user_input)
+
+        with self._lock:
+            self._exact[key] = template
+            self._exact.move_to_end(key)
+            while len(self._exact) > self.MAX_ENTRIES:
+                self._exact.popitem(last=False)
+
+            if embedding is not None:
+                self._entries.append((embedding, template))
+                if len(self._entries) > self.MAX_ENTRIES:
+                    del self._entries[0]
+
+
+class PlannerAgent:
+    """
+    Planner Agent converts user requests into step-by-step execution plans
+    Uses LLM to analyze task and select appropriate tools
+    """
+
+    def __init__(self):
+        self.tool_registry = get_registry()
+        self.plan_cache = PlanCache() if self._cache_enabled() else None
+        # Build the system instruction once - the tool registry is fixed at
+        # startup, and a stable prefix lets the provider cache it
+        self.system_instruction = PLANNER_SYSTEM_TEMPLATE.format(
+            tools=self.tool_registry.get_tools_description()
+        )
+        # Valid tool names for plan validation (cheap set lookup instead of
+        # exception-driven registry probing)
+        self._valid_tools = frozenset(self.tool_registry.list_tools()) | {"none"}
+
+    @cached_property
+    def llm(self):
+        """LLM client, created on first use so startup doesn't pay SDK init"""
+        return get_llm_client()
+
+    @staticmethod
+    def _cache_enabled() -> bool:
+        """Check whether plan caching is enabled via environment"""
+        return os.getenv("PLAN_CACHE_ENABLED", "").lower() in ("1", "true", "yes")
+
+    @staticmethod
+    def _streaming_enabled() -> bool:
+        """Check whether streamed planning is enabled via environment"""
+        return os.getenv("PLANNER_STREAMING", "").lower() in ("1", "true", "yes")
+
+    def create_plan(self, user_input: str, session=None) -> Dict[str, Any]:
+        """
+        Create execution plan from user input
+
+        Args:
+            user_input: Natural language task description
+            session: Optional shared chat session (see LLMClient.start_session)
+
+        Returns:
+            Dictionary containing the execution plan with steps
+        """
+        # Fast path: return cached plan for recurring requests
+        if self.plan_cache is not None:
+            cached = self.plan_cache.get_exact(user_input)
+            if cached is not None:
+                cached["status"] = "success"
+                cached["cache_hit"] = "exact"
+                return cached
+
+        system_instruction = self.system_instruction
 
-Remember to output ONLY valid JSON matching the schema provided."""
-        
         try:
-            # Get structured plan from LLM
-            plan = self.llm.get_json_completion(
-                prompt=prompt,
-                system_instruction=system_instruction,
-                temperature=0.3
-            )
-            
+            # Semantic path: adapt a cached plan for a similar request
+            # (much shorter context than planning from scratch)
+            similar_plan = None
+            if self.plan_cache is not None:
+                similar_plan = self.plan_cache.get_similar(user_input)
+
+            if similar_plan is not None:
+                plan = self._adapt_cached_plan(
+                    user_input, similar_plan, system_instruction, session
+                )
+            else:
+                plan = self._plan_with_llm(user_input, system_instruction, session)
+
             # Validate plan structure
             self._validate_plan(plan)
-            
+
+            # Cache validated plans for future requests
+            if self.plan_cache is not None:
+                self.plan_cache.store(user_input, plan)
+
             plan["status"] = "success"
             return plan
-            
+
         except Exception as e:
             return {
                 "status": "error",
@@ -95,40 +258,137 @@ Remember to output ONLY valid JSON matching the schema provided."""
                 "task": user_input,
                 "steps": []
             }
-    
+
+    def _plan_with_llm(
+        self,
+        user_input: str,
+        system_instruction: str,
+        session=None
+    ) -> Dict[str, Any]:
+        """Create a fresh plan from scratch via the LLM"""
+        prompt = f"""Analyze this user request and create an execution plan:
+
+User Request: {user_input}
+
+Create a detailed step-by-step plan to accomplish this task. Consider:
+- What information needs to be gathered?
+- Which tools are needed?
+- What order makes sense?
+- What parameters are required?
+
+Remember to output ONLY valid JSON matching the schema provided."""
+
+        if session is not None:
+            return self.llm.send_json_message(session, prompt, temperature=0.3)
+
+        if self._streaming_enabled():
+            return self._plan_streaming(prompt, system_instruction)
+
+        return self.llm.get_json_completion(
+            prompt=prompt,
+            system_instruction=system_instruction,
+            temperature=0.3
+        )
+
+    def _plan_streaming(self, prompt: str, system_instruction: str) -> Dict[str, Any]:
+        """
+        Stream the plan JSON, warming tools as their names appear
+
+        Tool names are spotted in the partial JSON while the model is
+        still generating later steps, and each named tool's warmup runs
+        on a background thread - plan generation overlaps with connection
+        setup instead of preceding it.
+
+        Args:
+            prompt: Planning prompt
+            system_instruction: Planner system instruction
+
+        Returns:
+            Parsed plan dictionary
+        """
+        buffer = ""
+        warmed = set()
+
+        for chunk in self.llm.stream_json_completion(
+            prompt,
+            system_instruction=system_instruction,
+            temperature=0.3
+        ):
+            buffer += chunk
+            for name in _TOOL_FIELD_RE.findall(buffer):
+                if name not in warmed:
+                    warmed.add(name)
+                    self._warm_tool(name)
+
+        return self.llm.parse_json_response(buffer)
+
+    def _warm_tool(self, name: str) -> None:
+        """Run a tool's warmup hook on a background thread"""
+        if name == "none":
+            return
+        try:
+            tool = self.tool_registry.get_tool(name)
+        except ValueError:
+            return  # Unknown tool - validation will report it
+        threading.Thread(target=tool.warmup, daemon=True).start()
+
+    def _adapt_cached_plan(
+        self,
+        user_input: str,
+        cached_plan: Dict[str, Any],
+        system_instruction: str,
+        session=None
+    ) -> Dict[str, Any]:
+        """
+        Adapt a cached plan template to a new, similar request
+
+        Args:
+            user_input: New natural language task description
+            cached_plan: Plan template from a semantically similar request
+            system_instruction: Planner system instruction
+            session: Optional shared chat session
+
+        Returns:
+            Adapted plan dictionary
+        """
+        prompt = f"""A very similar request was planned before. Adapt this existing plan to the new request, changing only parameters and descriptions that need to change:
+
+Existing Plan: {json.dumps(cached_plan)}
+
+New Request: {user_input}
+
+Output ONLY the adapted plan as valid JSON matching the same schema."""
+
+        if session is not None:
+            return self.llm.send_json_message(session, prompt, temperature=0.3)
+
+        return self.llm.get_json_completion(
+            prompt=prompt,
+            system_instruction=system_instruction,
+            temperature=0.3
+        )
+
     def _validate_plan(self, plan: Dict[str, Any]) -> None:
         """
         Validate that the plan has the correct structure
-        
+
         Args:
             plan: Plan dictionary to validate
-            
+
         Raises:
             ValueError: If plan structure is invalid
         """
-        if "task" not in plan:
-            raise ValueError("Plan missing 'task' field")
-        
-        if "steps" not in plan or not isinstance(plan["steps"], list):
-            raise ValueError("Plan missing 'steps' list")
-        
-        if len(plan["steps"]) == 0:
+        # Structural validation runs in compiled pydantic-core, with
+        # structured error messages for free
+        try:
+            validated = Plan.model_validate(plan)
+        except ValidationError as e:
+            raise ValueError(f"Invalid plan structure: {e}") from None
+
+        if len(validated.steps) == 0:
             raise ValueError("Plan has no steps")
-        
-        for i, step in enumerate(plan["steps"]):
-            if "step_number" not in step:
-                raise ValueError(f"Step {i} missing 'step_number'")
-            if "action" not in step:
-                raise ValueError(f"Step {i} missing 'action'")
-            if "tool" not in step:
-                raise ValueError(f"Step {i} missing 'tool'")
-            if "parameters" not in step:
-                raise ValueError(f"Step {i} missing 'parameters'")
-            
-            # Validate tool exists (unless it's "none")
-            tool_name = step["tool"]
-            if tool_name != "none":
-                try:
-                    self.tool_registry.get_tool(tool_name)
-                except ValueError:
-                    raise ValueError(f"Step {i} references unknown tool: {tool_name}")
+
+        # Validate tools exist (unless "none")
+        for i, step in enumerate(validated.steps):
+            if step.tool not in self._valid_tools:
+                raise ValueError(f"Step {i} references unknown tool: {step.tool}")
@@ -2,23 +2,85 @@
 Verifier Agent
 Validates execution results, checks completeness, and formats final output
 """
+import os
+import logging
+import orjson
+from functools import cached_property
 from typing import Dict, Any, List
+from embedding import embed
 from llm import get_llm_client
 
 
+logger = logging.getLogger("verifier")
+
+
+# Result fields too bulky to be worth sending to the verifier LLM
+BULKY_RESULT_FIELDS = frozenset({"html", "raw_html", "base64", "screenshot"})
+
+
+# Preview extractors dispatched on a marker key in the result dict.
+# Tools can register their own via register_preview_extractor.
+PREVIEW_EXTRACTORS = {
+    "repositories": lambda r: f"Found {len(r['repositories'])} repositories",
+    "weather": lambda r: (
+        f"Temperature: {r['weather'].get('temperature')}°, {r['weather'].get('condition')}"
+    ),
+    "user": lambda r: f"User: {r['user'].get('username')}",
+}
+
+
+def register_preview_extractor(key, extractor) -> None:
+    """
+    Register a result-preview extractor for a new result type
+
+    Args:
+        key: Marker key identifying the result type (e.g. 'repositories')
+        extractor: Callable taking the result dict and returning a preview string
+    """
+    PREVIEW_EXTRACTORS[key] = extractor
+
+
+# Static verifier system instruction - a stable prefix that the provider
+# can cache across calls
+VERIFIER_SYSTEM_INSTRUCTION = """You are a results verification agent. Your job is to:
+1. Analyze execution results from multiple steps
+2. Check if the original task was completed successfully
+3. Identify any missing or incomplete data
+4. Create a comprehensive, user-friendly summary
+
+Your output must be valid JSON with this structure (emit the fields in exactly this order, summary first, so it can be streamed to the user before the rest):
+{
+    "summary": "Human-readable summary of results",
+    "status": "complete" | "partial" | "incomplete",
+    "completeness_score": 0-100,
+    "findings": {
+        "key_results": ["list of main findings"],
+        "data_quality": "assessment of data quality",
+        "missing_information": ["list of missing data, if any"]
+    },
+    "recommendations": ["suggestions if task was incomplete"],
+    "data": {
+        // Structured data from successful steps
+    }
+}"""
+
+
 class VerifierAgent:
     """
     Verifier Agent validates execution results and creates final output
     Uses LLM to check completeness and format results
     """
     
-    def __init__(self):
-        self.llm = get_llm_client()
-    
+    @cached_property
+    def llm(self):
+        """LLM client, created on first use so startup doesn't pay SDK init"""
+        return get_llm_client()
+
     def verify_and_format(
         self,
         plan: Dict[str, Any],
-        execution_result: Dict[str, Any]
+        execution_result: Dict[str, Any],
+        session=None
     ) -> Dict[str, Any]:
         """
         Verify execution results and create formatted final output
@@ -26,11 +88,12 @@ class VerifierAgent:
         Args:
             plan: Original execution plan
             execution_result: Results from ExecutorAgent
+            session: Optional shared chat session (see LLMClient.start_session)
             
         Returns:
             Verified and formatted final output
         """
-        print("\n[Verifier] Verifying execution results...")
+        logger.info("Verifying execution results...")
         
         # Check if execution failed
         if execution_result.get("status") == "error":
@@ -58,25 +121,223 @@ class VerifierAgent:
         
         # Prepare data for LLM verification
         task = plan.get("task", "Unknown task")
-        
+
+        # Trivial results don't need semantic verification - skip the LLM
+        if not failed_steps and self._skip_trivial_enabled():
+            trivial = self._verify_trivial(task, step_results, successful_steps)
+            if trivial is not None:
+                return trivial
+
         # Create verification prompt
         verification_result = self._verify_with_llm(
             task=task,
             plan=plan,
             step_results=step_results,
             successful_steps=successful_steps,
-            failed_steps=failed_steps
+            failed_steps=failed_steps,
+            session=session
         )
         
         return verification_result
     
+    def verify_and_format_stream(self, plan: Dict[str, Any], execution_result: Dict[str, Any]):
+        """
+        Stream verification output as server-sent-event style dicts
+
+        Yields {"event": "summary", "text": chunk} events while the LLM is
+        still generating the summary field, then a single
+        {"event": "final", "data": verification} event with the full
+        parsed verification result.
+
+        Args:
+            plan: Original execution plan
+            execution_result: Results from ExecutorAgent
+        """
+        step_results = execution_result.get("results", [])
+        failed_steps = [r for r in step_results if not r.get("success")]
+        successful_steps = [r for r in step_results if r.get("success")]
+
+        # Preconditions that don't need the LLM resolve immediately
+        if execution_result.get("status") == "error" or len(successful_steps) == 0:
+            yield {"event": "final", "data": self.verify_and_format(plan, execution_result)}
+            return
+
+        task = plan.get("task", "Unknown task")
+
+        if not failed_steps and self._skip_trivial_enabled():
+            trivial = self._verify_trivial(task, step_results, successful_steps)
+            if trivial is not None:
+                yield {"event": "summary", "text": trivial.get("summary", "")}
+                yield {"event": "final", "data": trivial}
+                return
+
+        logger.info("Streaming verification of execution results...")
+
+        prompt, full_results = self._build_verification_prompt(
+            task=task,
+            plan=plan,
+            step_results=step_results,
+            successful_steps=successful_steps,
+            failed_steps=failed_steps
+        )
+
+        buffer = ""
+        try:
+            chunks = self.llm.stream_json_completion(
+                prompt=prompt,
+                system_instruction=VERIFIER_SYSTEM_INSTRUCTION,
+                temperature=0.2
+            )
+
+            for buffer, summary_chunk in self._scan_summary_field(chunks):
+                if summary_chunk:
+                    yield {"event": "summary", "text": summary_chunk}
+
+            verification = self.llm.parse_json_response(buffer)
+            verification["raw_data"] = full_results
+            verification["failed_steps"] = failed_steps if failed_steps else None
+            yield {"event": "final", "data": verification}
+
+        except Exception as e:
+            yield {
+                "event": "final",
+                "data": self._create_fallback_verification(
+                    task=task,
+                    successful_steps=successful_steps,
+                    failed_steps=failed_steps,
+                    full_results=full_results,
+                    error=str(e)
+                )
+            }
+
+    @staticmethod
+    def _skip_trivial_enabled() -> bool:
+        """Check whether the trivial-verification fast path is enabled"""
+        return os.getenv("VERIFIER_SKIP_TRIVIAL", "").lower() in ("1", "true", "yes")
+
+    def _verify_trivial(
+        self,
+        task: str,
+        step_results: List[Dict[str, Any]],
+        successful_steps: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Synthesize a verification without the LLM for trivial results
+
+        Applies when every step succeeded and either the plan had a single
+        step or the collected results are tiny - there is nothing for the
+        LLM to semantically verify, so the round-trip is pure overhead.
+
+        Args:
+            task: Original user task
+            step_results: All step results
+            successful_steps: Successfully executed steps
+
+        Returns:
+            Verification dict, or None if the results aren't trivial
+        """
+        full_results = {}
+        for step in successful_steps:
+            full_results[f"step_{step.get('step_number')}"] = step.get("result", {})
+
+        trivial = len(step_results) == 1
+        if not trivial:
+            try:
+                trivial = len(orjson.dumps(full_results, default=str)) < 256
+            except (TypeError, ValueError):
+                trivial = False
+
+        if not trivial:
+            return None
+
+        logger.info("Trivial result - skipping LLM verification")
+
+        key_results = [
+            self._extract_result_preview(step.get("result", {}))
+            for step in successful_steps
+        ]
+
+        return {
+            "status": "complete",
+            "completeness_score": 100,
+            "summary": f"Completed: {task}",
+            "findings": {
+                "key_results": key_results,
+                "data_quality": "All steps completed successfully",
+                "missing_information": []
+            },
+            "recommendations": [],
+            "data": full_results,
+            "raw_data": full_results,
+            "failed_steps": None
+        }
+
+    @staticmethod
+    def _scan_summary_field(chunks):
+        """
+        Incrementally extract the "summary" string while accumulating JSON
+
+        A small state machine scans the stream for the summary field and
+        decodes its string value as it arrives, so it can be surfaced
+        before the rest of the JSON has been generated.
+
+        Args:
+            chunks: Iterable of raw JSON text chunks
+
+        Yields:
+            (buffer_so_far, decoded_summary_chunk) pairs; the summary chunk
+            is an empty string once the field has been fully consumed
+        """
+        escapes = {"n": "\n", "t": "\t", "r": "\r", '"': '"', "\\": "\\", "/": "/"}
+        key = '"summary"'
+        state = "seek"  # seek -> colon -> string -> done
+        escaped = False
+        buffer = ""
+        scan = 0
+
+        for chunk in chunks:
+            buffer += chunk
+            emitted = []
+
+            while scan < len(buffer) and state != "done":
+                if state == "seek":
+                    idx = buffer.find(key, scan)
+                    if idx == -1:
+                        # Keep a small tail so a key split across chunks is found
+                        scan = max(scan, len(buffer) - len(key) + 1)
+                        break
+                    scan = idx + len(key)
+                    state = "colon"
+                elif state == "colon":
+                    ch = buffer[scan]
+                    scan += 1
+                    if ch == '"':
+                        state = "string"
+                    elif ch not in ": \t\r\n":
+                        state = "seek"  # not a string value, keep looking
+                else:  # string
+                    ch = buffer[scan]
+                    scan += 1
+                    if escaped:
+                        emitted.append(escapes.get(ch, "\\" + ch))
+                        escaped = False
+                    elif ch == "\\":
+                        escaped = True
+                    elif ch == '"':
+                        state = "done"
+                    else:
+                        emitted.append(ch)
+
+            yield buffer, "".join(emitted)
+
     def _verify_with_llm(
         self,
         task: str,
         plan: Dict[str, Any],
         step_results: List[Dict[str, Any]],
         successful_steps: List[Dict[str, Any]],
-        failed_steps: List[Dict[str, Any]]
+        failed_steps: List[Dict[str, Any]],
+        session=None
     ) -> Dict[str, Any]:
         """
         Use LLM to verify results and create final formatted output
@@ -87,32 +348,69 @@ class VerifierAgent:
             step_results: All step results
             successful_steps: Successfully executed steps
             failed_steps: Failed steps
+            session: Optional shared chat session
             
         Returns:
             Verified and formatted output
         """
-        system_instruction = """You are a results verification agent. Your job is to:
-1. Analyze execution results from multiple steps
-2. Check if the original task was completed successfully
-3. Identify any missing or incomplete data
-4. Create a comprehensive, user-friendly summary
+        prompt, full_results = self._build_verification_prompt(
+            task=task,
+            plan=plan,
+            step_results=step_results,
+            successful_steps=successful_steps,
+            failed_steps=failed_steps
+        )
 
-Your output must be valid JSON with this structure:
-{
-    "status": "complete" | "partial" | "incomplete",
-    "completeness_score": 0-100,
-    "summary": "Human-readable summary of results",
-    "findings": {
-        "key_results": ["list of main findings"],
-        "data_quality": "assessment of data quality",
-        "missing_information": ["list of missing data, if any"]
-    },
-    "recommendations": ["suggestions if task was incomplete"],
-    "data": {
-        // Structured data from successful steps
-    }
-}"""
-        
+        try:
+            # Get structured verification from LLM. On a shared session the
+            # planner turn is already server-side context, so only the new
+            # results are processed.
+            if session is not None:
+                verification = self.llm.send_json_message(session, prompt, temperature=0.2)
+            else:
+                verification = self.llm.get_json_completion(
+                    prompt=prompt,
+                    system_instruction=VERIFIER_SYSTEM_INSTRUCTION,
+                    temperature=0.2
+                )
+            
+            # Add raw data to verification result
+            verification["raw_data"] = full_results
+            verification["failed_steps"] = failed_steps if failed_steps else None
+            
+            return verification
+            
+        except Exception as e:
+            # Fallback if LLM verification fails
+            return self._create_fallback_verification(
+                task=task,
+                successful_steps=successful_steps,
+                failed_steps=failed_steps,
+                full_results=full_results,
+                error=str(e)
+            )
+    
+    def _build_verification_prompt(
+        self,
+        task: str,
+        plan: Dict[str, Any],
+        step_results: List[Dict[str, Any]],
+        successful_steps: List[Dict[str, Any]],
+        failed_steps: List[Dict[str, Any]]
+    ):
+        """
+        Build the verification prompt and collect full results data
+
+        Args:
+            task: Original user task
+            plan: Execution plan
+            step_results: All step results
+            successful_steps: Successfully executed steps
+            failed_steps: Failed steps
+
+        Returns:
+            Tuple of (prompt string, full results dict)
+        """
         # Prepare step results summary
         steps_summary = []
         for step in step_results:
@@ -123,13 +421,16 @@ Your output must be valid JSON with this structure:
                 "success": step.get("success"),
                 "result_preview": self._extract_result_preview(step.get("result", {}))
             })
-        
+
+        # Collapse near-duplicate previews to shrink the prompt
+        steps_summary = self._dedupe_previews(steps_summary)
+
         # Create full results data
         full_results = {}
         for step in successful_steps:
             step_num = step.get("step_number")
             full_results[f"step_{step_num}"] = step.get("result", {})
-        
+
         prompt = f"""Verify the execution results for this task:
 
 Original Task: {task}
@@ -153,51 +454,60 @@ Focus on:
 - What, if anything, is missing?
 
 Output valid JSON only."""
-        
-        try:
-            # Get structured verification from LLM
-            verification = self.llm.get_json_completion(
-                prompt=prompt,
-                system_instruction=system_instruction,
-                temperature=0.2
-            )
-            
-            # Add raw data to verification result
-            verification["raw_data"] = full_results
-            verification["failed_steps"] = failed_steps if failed_steps else None
-            
-            return verification
-            
-        except Exception as e:
-            # Fallback if LLM verification fails
-            return self._create_fallback_verification(
-                task=task,
-                successful_steps=successful_steps,
-                failed_steps=failed_steps,
-                full_results=full_results,
-                error=str(e)
-            )
-    
+
+        return prompt, full_results
+
+    @staticmethod
+    def _dedupe_previews(
+        steps_summary: List[Dict[str, Any]],
+        similarity_threshold: float = 0.97
+    ) -> List[Dict[str, Any]]:
+        """
+        Replace near-duplicate result previews with back-references
+
+        All previews are embedded in a single batch through the shared
+        embedding model; previews whose cosine similarity to an earlier
+        step exceeds the threshold are replaced with a short pointer,
+        shrinking the verifier prompt. A no-op when fewer than two
+        previews exist or the embedding model is unavailable.
+
+        Args:
+            steps_summary: Step summaries with result_preview fields
+            similarity_threshold: Minimum cosine similarity to collapse
+
+        Returns:
+            Step summaries with duplicates collapsed (modified in place)
+        """
+        if len(steps_summary) < 2:
+            return steps_summary
+
+        vectors = embed([step["result_preview"] for step in steps_summary])
+        if vectors is None:
+            return steps_summary
+
+        similarities = vectors @ vectors.T
+        for i in range(1, len(steps_summary)):
+            for j in range(i):
+                if similarities[i, j] >= similarity_threshold:
+                    steps_summary[i]["result_preview"] = (
+                        f"(same as step {steps_summary[j].get('step_number')})"
+                    )
+                    break
+        return steps_summary
+
     def _extract_result_preview(self, result: Dict[str, Any]) -> str:
         """Extract a brief preview of result data"""
         if not result:
             return "No data"
-        
+
         if "error" in result:
             return f"Error: {result['error']}"
-        
-        # Extract key information based on result type
-        if "repositories" in result:
-            repos = result["repositories"]
-            return f"Found {len(repos)} repositories"
-        elif "weather" in result:
-            weather = result["weather"]
-            return f"Temperature: {weather.get('temperature')}°, {weather.get('condition')}"
-        elif "user" in result:
-            user = result["user"]
-            return f"User: {user.get('username')}"
-        else:
-            return "Data available"
+
+        # Dispatch on the result's marker key
+        return next(
+            (fn(result) for key, fn in PREVIEW_EXTRACTORS.items() if key in result),
+            "Data available"
+        )
     
     def _format_steps_summary(self, steps: List[Dict[str, Any]]) -> str:
         """Format steps summary for LLM"""
@@ -211,15 +521,51 @@ Output valid JSON only."""
         return "\n".join(lines)
     
     def _format_full_results(self, results: Dict[str, Any]) -> str:
-        """Format full results data for LLM (with truncation)"""
-        import json
-        formatted = json.dumps(results, indent=2)
-        
-        # Truncate if too long
-        if len(formatted) > 2000:
-            formatted = formatted[:2000] + "\n... (truncated)"
-        
-        return formatted
+        """Format results data for the LLM, compacted per step"""
+        compact = {key: self._compact_result(value) for key, value in results.items()}
+        return orjson.dumps(compact, default=str).decode()
+
+    def _compact_result(
+        self,
+        result: Any,
+        max_chars: int = 400,
+        max_items: int = 5
+    ) -> Any:
+        """
+        Compact a step result for inclusion in the verifier prompt
+
+        Truncates long strings, keeps only the first few items of lists
+        (noting how many were dropped), and drops known-bulky fields, so
+        the LLM sees a representative sample instead of the full payload.
+        The untruncated results are still returned to the caller as
+        raw_data - only the prompt is compacted.
+
+        Args:
+            result: Step result value (dict, list, or scalar)
+            max_chars: Maximum length for string values
+            max_items: Maximum number of list items to keep
+
+        Returns:
+            Compacted copy of the result
+        """
+        if isinstance(result, dict):
+            return {
+                key: self._compact_result(value, max_chars, max_items)
+                for key, value in result.items()
+                if key not in BULKY_RESULT_FIELDS
+            }
+        if isinstance(result, list):
+            if len(result) > max_items:
+                compacted = [
+                    self._compact_result(item, max_chars, max_items)
+                    for item in result[:max_items]
+                ]
+                compacted.append(f"...(+{len(result) - max_items} more)")
+                return compacted
+            return [self._compact_result(item, max_chars, max_items) for item in result]
+        if isinstance(result, str) and len(result) > max_chars:
+            return result[:max_chars] + "...(truncated)"
+        return result
     
     def _create_fallback_verification(
         self,
@@ -3,13 +3,16 @@ FastAPI Server for AI Operations Assistant
 Provides REST API endpoints
 """
 import os
+import json
+import asyncio
+import logging
 from typing import Dict, Any
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
+from sse_starlette.sse import EventSourceResponse
 from dotenv import load_dotenv
 
-from main import AIOperationsAssistant
-
 # Load environment variables
 load_dotenv()
 
@@ -17,12 +20,21 @@ load_dotenv()
 app = FastAPI(
     title="AI Operations Assistant",
     description="Multi-agent AI system for task automation",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# When disabled (STRICT_VALIDATION=0), /process skips per-response
+# pydantic validation and serializes the trusted internal result directly
+STRICT_VALIDATION = os.getenv("STRICT_VALIDATION", "1") != "0"
+
 # Initialize assistant (will be done on startup)
 assistant = None
 
+# Bound concurrent task processing so overload is shed instead of
+# queueing unbounded work (set on startup)
+inflight_limiter = None
+
 
 class TaskRequest(BaseModel):
     """Request model for task processing"""
@@ -32,6 +44,10 @@ class TaskRequest(BaseModel):
 
 class TaskResponse(BaseModel):
     """Response model for task results"""
+    # Drop keys outside the contract (e.g. bulky raw_data) in C instead
+    # of failing or carrying them through validation
+    model_config = ConfigDict(extra="ignore")
+
     status: str
     summary: str
     completeness_score: int = None
@@ -44,15 +60,35 @@ class TaskResponse(BaseModel):
 @app.on_event("startup")
 async def startup_event():
     """Initialize the assistant on startup"""
-    global assistant
-    
+    global assistant, inflight_limiter
+
     # Check for required API key
     if not os.getenv("GOOGLE_API_KEY"):
         raise RuntimeError(
             "GOOGLE_API_KEY environment variable not set. "
             "Please create a .env file with your API keys."
         )
-    
+
+    # Configure agent logging once for the whole process
+    logging.basicConfig(
+        format="%(asctime)s %(levelname)s %(name)s %(message)s",
+        level=os.getenv("LOG_LEVEL", "INFO")
+    )
+
+    inflight_limiter = asyncio.Semaphore(int(os.getenv("MAX_INFLIGHT", "16")))
+
+    # Size the default threadpool so offloaded tasks run concurrently
+    try:
+        import anyio
+        anyio.to_thread.current_default_thread_limiter().total_tokens = int(
+            os.getenv("API_WORKER_THREADS", "32")
+        )
+    except ImportError:
+        pass
+
+    # Imported here so module import (uvicorn --reload, --help) stays cheap
+    from main import AIOperationsAssistant
+
     print("Initializing AI Operations Assistant...")
     assistant = AIOperationsAssistant()
     print("Assistant ready!")
@@ -95,7 +131,7 @@ async def get_tools():
     }
 
 
-@app.post("/process", response_model=TaskResponse)
+@app.post("/process", response_model=TaskResponse if STRICT_VALIDATION else None)
 async def process_task(request: TaskRequest):
     """
     Process a natural language task
@@ -113,12 +149,63 @@ async def process_task(request: TaskRequest):
         raise HTTPException(status_code=400, detail="Task cannot be empty")
     
     try:
-        result = assistant.process_task(request.task, verbose=request.verbose)
+        # Offload the blocking pipeline to a worker thread so the event
+        # loop stays free to serve other requests
+        async with inflight_limiter:
+            result = await asyncio.to_thread(
+                assistant.process_task, request.task, request.verbose
+            )
+        if not STRICT_VALIDATION:
+            # Trusted internal data - serialize directly, no model validation
+            return ORJSONResponse(content=result)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing task: {str(e)}")
 
 
+@app.post("/process/stream")
+async def process_task_stream(request: TaskRequest):
+    """
+    Process a task and stream results as server-sent events
+
+    Emits 'summary' events with text chunks while the verifier is still
+    generating, then a 'final' event with the complete result.
+
+    Args:
+        request: TaskRequest with task description
+
+    Returns:
+        EventSourceResponse streaming verification events
+    """
+    if assistant is None:
+        raise HTTPException(status_code=503, detail="Assistant not initialized")
+
+    if not request.task or not request.task.strip():
+        raise HTTPException(status_code=400, detail="Task cannot be empty")
+
+    async def event_source():
+        # Same load shedding as the other endpoints; the semaphore is
+        # held for the whole stream since the pipeline runs within it
+        async with inflight_limiter:
+            plan = await asyncio.to_thread(assistant.planner.create_plan, request.task)
+            execution_result = await asyncio.to_thread(
+                assistant.executor.execute_plan, plan
+            )
+
+            # Drain the verifier's blocking generator from worker threads
+            # so the event loop stays free between chunks
+            events = assistant.verifier.verify_and_format_stream(plan, execution_result)
+            sentinel = object()
+            while True:
+                event = await asyncio.to_thread(next, events, sentinel)
+                if event is sentinel:
+                    break
+                name = event.pop("event")
+                yield {"event": name, "data": json.dumps(event)}
+
+    return EventSourceResponse(event_source())
+
+
 @app.post("/process/simple")
 async def process_task_simple(request: TaskRequest):
     """
@@ -137,7 +224,8 @@ async def process_task_simple(request: TaskRequest):
         raise HTTPException(status_code=400, detail="Task cannot be empty")
     
     try:
-        summary = assistant.process_task_simple(request.task)
+        async with inflight_limiter:
+            summary = await asyncio.to_thread(assistant.process_task_simple, request.task)
         return {"summary": summary}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing task: {str(e)}")
@@ -150,5 +238,12 @@ if __name__ == "__main__":
     print("Starting AI Operations Assistant API Server...")
     print("API will be available at: http://localhost:8000")
     print("Interactive docs at: http://localhost:8000/docs")
-    
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    # Multiple workers help CPU-bound parts; requests within a worker
+    # already run concurrently thanks to the threadpool offload above.
+    # uvicorn requires an import string (not an app object) for workers > 1.
+    workers = int(os.getenv("UVICORN_WORKERS", "1"))
+    if workers > 1:
+        uvicorn.run("api:app", host="0.0.0.0", port=8000, workers=workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8000)
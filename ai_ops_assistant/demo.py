@@ -2,15 +2,44 @@
 Demo Script for AI Operations Assistant
 Shows example inputs and expected outputs
 """
-import json
+import sys
+
+# Section separator, computed once instead of at every call site
+SEP = "=" * 70
+
+# All output is accumulated and written in a single sys.stdout.write at
+# the end: one buffer flush instead of a lock/flush per print call
+_parts = []
+
+
+def emit(text=""):
+    """Buffer one line of demo output"""
+    _parts.append(str(text))
+    _parts.append("\n")
+
+
+try:
+    import orjson
+
+    def dump_json(data):
+        """Buffer data serialized with orjson (C-level)"""
+        _parts.append(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
+        _parts.append("\n")
+except ImportError:
+    import json
+
+    def dump_json(data):
+        """Fallback serializer when orjson is not installed"""
+        _parts.append(json.dumps(data, indent=2))
+        _parts.append("\n")
 
 # Example 1: Simple GitHub Search
-print("="*70)
-print("EXAMPLE 1: Simple GitHub Repository Search")
-print("="*70)
-print("\nUser Input:")
-print("  'Find the top 3 Python web frameworks on GitHub'")
-print("\n--- PLANNER AGENT OUTPUT ---")
+emit(SEP)
+emit("EXAMPLE 1: Simple GitHub Repository Search")
+emit(SEP)
+emit("\nUser Input:")
+emit("  'Find the top 3 Python web frameworks on GitHub'")
+emit("\n--- PLANNER AGENT OUTPUT ---")
 planner_output_1 = {
     "task": "Find the top 3 Python web frameworks on GitHub",
     "status": "success",
@@ -29,9 +58,9 @@ planner_output_1 = {
         }
     ]
 }
-print(json.dumps(planner_output_1, indent=2))
+dump_json(planner_output_1)
 
-print("\n--- EXECUTOR AGENT OUTPUT ---")
+emit("\n--- EXECUTOR AGENT OUTPUT ---")
 executor_output_1 = {
     "status": "success",
     "task": "Find the top 3 Python web frameworks on GitHub",
@@ -80,9 +109,9 @@ executor_output_1 = {
         }
     ]
 }
-print(json.dumps(executor_output_1, indent=2))
+dump_json(executor_output_1)
 
-print("\n--- VERIFIER AGENT OUTPUT ---")
+emit("\n--- VERIFIER AGENT OUTPUT ---")
 verifier_output_1 = {
     "status": "complete",
     "completeness_score": 100,
@@ -101,16 +130,16 @@ verifier_output_1 = {
         "repositories": executor_output_1["results"][0]["result"]["repositories"]
     }
 }
-print(json.dumps(verifier_output_1, indent=2))
+dump_json(verifier_output_1)
 
 # Example 2: Weather Query
-print("\n\n" + "="*70)
-print("EXAMPLE 2: Weather Information")
-print("="*70)
-print("\nUser Input:")
-print("  'What's the weather like in London?'")
+emit("\n\n" + SEP)
+emit("EXAMPLE 2: Weather Information")
+emit(SEP)
+emit("\nUser Input:")
+emit("  'What's the weather like in London?'")
 
-print("\n--- PLANNER AGENT OUTPUT ---")
+emit("\n--- PLANNER AGENT OUTPUT ---")
 planner_output_2 = {
     "task": "Get current weather for London",
     "status": "success",
@@ -128,9 +157,9 @@ planner_output_2 = {
         }
     ]
 }
-print(json.dumps(planner_output_2, indent=2))
+dump_json(planner_output_2)
 
-print("\n--- EXECUTOR AGENT OUTPUT ---")
+emit("\n--- EXECUTOR AGENT OUTPUT ---")
 executor_output_2 = {
     "status": "success",
     "task": "Get current weather for London",
@@ -167,9 +196,9 @@ executor_output_2 = {
         }
     ]
 }
-print(json.dumps(executor_output_2, indent=2))
+dump_json(executor_output_2)
 
-print("\n--- VERIFIER AGENT OUTPUT ---")
+emit("\n--- VERIFIER AGENT OUTPUT ---")
 verifier_output_2 = {
     "status": "complete",
     "completeness_score": 100,
@@ -189,16 +218,16 @@ verifier_output_2 = {
         "weather": executor_output_2["results"][0]["result"]
     }
 }
-print(json.dumps(verifier_output_2, indent=2))
+dump_json(verifier_output_2)
 
 # Example 3: Multi-step Task
-print("\n\n" + "="*70)
-print("EXAMPLE 3: Multi-Step Task (GitHub + Weather)")
-print("="*70)
-print("\nUser Input:")
-print("  'Find machine learning repositories on GitHub and tell me the weather in San Francisco'")
+emit("\n\n" + SEP)
+emit("EXAMPLE 3: Multi-Step Task (GitHub + Weather)")
+emit(SEP)
+emit("\nUser Input:")
+emit("  'Find machine learning repositories on GitHub and tell me the weather in San Francisco'")
 
-print("\n--- PLANNER AGENT OUTPUT ---")
+emit("\n--- PLANNER AGENT OUTPUT ---")
 planner_output_3 = {
     "task": "Find machine learning repositories on GitHub and get weather for San Francisco",
     "status": "success",
@@ -227,9 +256,9 @@ planner_output_3 = {
         }
     ]
 }
-print(json.dumps(planner_output_3, indent=2))
+dump_json(planner_output_3)
 
-print("\n--- FINAL RESULT ---")
+emit("\n--- FINAL RESULT ---")
 final_result = {
     "status": "complete",
     "completeness_score": 100,
@@ -257,12 +286,12 @@ final_result = {
         }
     }
 }
-print(json.dumps(final_result, indent=2))
+dump_json(final_result)
 
-print("\n\n" + "="*70)
-print("ARCHITECTURE DEMONSTRATION")
-print("="*70)
-print("""
+emit("\n\n" + SEP)
+emit("ARCHITECTURE DEMONSTRATION")
+emit(SEP)
+emit("""
 This demonstrates the three-agent architecture:
 
 1. PLANNER AGENT (LLM-powered)
@@ -288,10 +317,10 @@ Each agent has a single, well-defined responsibility and uses LLM
 independently for reasoning (Planner & Verifier only).
 """)
 
-print("\n" + "="*70)
-print("EVALUATION CRITERIA COVERAGE")
-print("="*70)
-print("""
+emit("\n" + SEP)
+emit("EVALUATION CRITERIA COVERAGE")
+emit(SEP)
+emit("""
 ✅ Agent Design (25 points)
    - Three distinct agents: Planner, Executor, Verifier
    - Clear separation of concerns
@@ -328,3 +357,5 @@ print("""
 
 TOTAL: 100/100 (Pass score: 70)
 """)
+
+sys.stdout.write("".join(_parts))
@@ -0,0 +1,64 @@
+"""
+Shared Embedding Model
+Lazy-loaded sentence-transformer used for semantic caching and deduplication
+"""
+import os
+import threading
+
+
+# Loaded once per process and shared by all callers
+_model = None
+_model_failed = False
+_lock = threading.Lock()
+
+
+def get_model():
+    """
+    Get the shared sentence-transformer model
+
+    The model is loaded lazily on first use. Set EMBEDDING_DEVICE to
+    'cuda' or 'mps' for hardware acceleration.
+
+    Returns:
+        SentenceTransformer instance, or None if the dependency is
+        unavailable (callers fall back to non-semantic behavior)
+    """
+    global _model, _model_failed
+    if _model is None and not _model_failed:
+        with _lock:
+            if _model is None and not _model_failed:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                    _model = SentenceTransformer(
+                        os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2"),
+                        device=os.getenv("EMBEDDING_DEVICE")
+                    )
+                except Exception:
+                    # Embeddings are optional - callers handle None
+                    _model_failed = True
+    return _model
+
+
+def embed(texts):
+    """
+    Batch-embed texts as a normalized float32 matrix
+
+    Encoding all texts in one call amortizes model overhead compared to
+    embedding strings one at a time.
+
+    Args:
+        texts: List of strings to embed
+
+    Returns:
+        (N, D) numpy array of normalized embeddings, or None if the
+        embedding model is unavailable
+    """
+    model = get_model()
+    if model is None:
+        return None
+    return model.encode(
+        list(texts),
+        batch_size=32,
+        convert_to_numpy=True,
+        normalize_embeddings=True
+    )
@@ -5,12 +5,57 @@ Handles all interactions with the Gemini model
 import os
 import json
 import time
+import copy
+import random
+import hashlib
+import datetime
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
 from typing import Optional, Dict, Any
-import google.generativeai as genai
+# The Gemini SDK (with its protobuf/grpc stack) costs hundreds of ms to
+# import, so it is loaded on first client construction rather than at
+# module import - `python main.py` with bad args never pays it
+genai = None
+RETRYABLE_EXCEPTIONS = ()
+NON_RETRYABLE_EXCEPTIONS = ()
+
+
+def _load_sdk() -> None:
+    """Import google.generativeai and error taxonomy on first use"""
+    global genai, RETRYABLE_EXCEPTIONS, NON_RETRYABLE_EXCEPTIONS
+    if genai is not None:
+        return
+
+    import google.generativeai as _genai
+    genai = _genai
+
+    try:
+        from google.api_core import exceptions as api_exceptions
+        # Transient provider errors worth retrying: rate limits, timeouts,
+        # temporary unavailability
+        RETRYABLE_EXCEPTIONS = (
+            api_exceptions.ResourceExhausted,
+            api_exceptions.DeadlineExceeded,
+            api_exceptions.ServiceUnavailable,
+            api_exceptions.InternalServerError,
+        )
+        # Deterministic failures - retrying sends the same bad request again
+        NON_RETRYABLE_EXCEPTIONS = (
+            api_exceptions.InvalidArgument,
+            api_exceptions.PermissionDenied,
+            api_exceptions.NotFound,
+            api_exceptions.FailedPrecondition,
+        )
+    except ImportError:
+        pass
 
 
 class LLMClient:
     """Wrapper for Google Gemini API with structured output support"""
+
+    # Upper bound on cached JSON completions before LRU eviction
+    JSON_CACHE_MAX_ENTRIES = 256
     
     def __init__(self, api_key: Optional[str] = None, model_name: str = "gemini-2.5-flash"):
         """
@@ -20,6 +65,8 @@ class LLMClient:
             api_key: Google API key (if None, reads from env)
             model_name: Gemini model to use (default: gemini-2.5-flash)
         """
+        _load_sdk()
+
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY not found in environment variables")
@@ -27,87 +74,454 @@ class LLMClient:
         genai.configure(api_key=self.api_key)
         self.model_name = model_name
         self.model = genai.GenerativeModel(model_name)
-        
+        # The SDK keeps one pooled transport client per process; bind it
+        # eagerly so every model handle reuses the same keep-alive channel
+        # instead of each call paying connection setup
+        try:
+            from google.generativeai.client import get_default_generative_client
+            self._api_client = get_default_generative_client()
+        except Exception:
+            self._api_client = None
+        # Per-call timeout (seconds) passed to the transport
+        self._request_options = {"timeout": float(os.getenv("LLM_TIMEOUT", "60"))}
+        # Models backed by provider-side cached system instructions,
+        # keyed by hash of the instruction text. Locked so concurrent
+        # first calls can't upload duplicate billable CachedContent.
+        self._cached_models: Dict[str, Any] = {}
+        self._models_lock = threading.Lock()
+        # Keys whose model handle is backed by CachedContent - these are
+        # evicted and rebuilt plain when the cached content expires
+        self._cache_backed: set = set()
+        # Lifetime requested for provider-side cached system instructions
+        self._content_cache_ttl = float(os.getenv("LLM_CONTENT_CACHE_TTL", "3600"))
+        # Token usage from the most recent call (for cost tracking)
+        self.last_usage: Dict[str, int] = {}
+        # In-flight completions for single-flight coalescing: key -> Future
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        # Backoff parameters shared with the executor's retry policy
+        self._retry_base_delay = float(os.getenv("RETRY_BASE_DELAY", "0.25"))
+        self._retry_max_backoff = float(os.getenv("RETRY_MAX_BACKOFF", "30"))
+        # TTL cache for parsed JSON completions: key -> (timestamp, result)
+        self._json_cache: OrderedDict = OrderedDict()
+        self._json_cache_lock = threading.Lock()
+        self._json_cache_ttl = float(os.getenv("LLM_JSON_CACHE_TTL", "3600"))
+
+    def _get_model(self, system_instruction: Optional[str], cache_system: bool):
+        """
+        Get a model configured with the given system instruction
+
+        When cache_system is True, the system instruction is uploaded once
+        as Gemini CachedContent and reused across calls, so repeated calls
+        pay reduced input cost for the static prefix. Falls back to a
+        regular model if content caching is unavailable (e.g. the
+        instruction is below the provider's minimum token count).
+
+        Args:
+            system_instruction: System instruction text (or None)
+            cache_system: Whether to use provider-side prompt caching
+
+        Returns:
+            GenerativeModel instance
+        """
+        if not system_instruction:
+            return self.model
+
+        # One model handle per distinct system instruction - GenerativeModel
+        # construction re-parses config on every call, and a stable handle
+        # keeps the transport channel warm. The lock is held across the
+        # CachedContent upload so racing first calls don't each create a
+        # billable cache object.
+        key = hashlib.sha256(system_instruction.encode("utf-8")).hexdigest()
+        with self._models_lock:
+            model = self._cached_models.get(key)
+            if model is not None:
+                return model
+
+            if cache_system:
+                try:
+                    from google.generativeai import caching
+                    cached_content = caching.CachedContent.create(
+                        model=self.model_name,
+                        system_instruction=system_instruction,
+                        ttl=datetime.timedelta(seconds=self._content_cache_ttl)
+                    )
+                    model = genai.GenerativeModel.from_cached_content(cached_content)
+                    self._cache_backed.add(key)
+                except Exception:
+                    # Caching not supported for this model/instruction size
+                    model = genai.GenerativeModel(
+                        model_name=self.model_name,
+                        system_instruction=system_instruction
+                    )
+            else:
+                model = genai.GenerativeModel(
+                    model_name=self.model_name,
+                    system_instruction=system_instruction
+                )
+
+            self._cached_models[key] = model
+            return model
+
+    def _evict_cached_model(self, system_instruction: Optional[str]) -> bool:
+        """
+        Drop a cache-backed model handle after its CachedContent expired
+
+        Args:
+            system_instruction: Instruction whose handle should be dropped
+
+        Returns:
+            True if a cache-backed handle was evicted (the next _get_model
+            call rebuilds one), False when there is nothing to evict
+        """
+        if not system_instruction:
+            return False
+        key = hashlib.sha256(system_instruction.encode("utf-8")).hexdigest()
+        with self._models_lock:
+            if key in self._cache_backed:
+                self._cache_backed.discard(key)
+                self._cached_models.pop(key, None)
+                return True
+        return False
+
+    def _record_usage(self, response) -> None:
+        """Record token usage (including cached prefix tokens) from a response"""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return
+        self.last_usage = {
+            "prompt_tokens": getattr(usage, "prompt_token_count", 0) or 0,
+            "cached_tokens": getattr(usage, "cached_content_token_count", 0) or 0,
+            "output_tokens": getattr(usage, "candidates_token_count", 0) or 0
+        }
+
+    @staticmethod
+    def _generation_config(temperature: float, response_mime_type: Optional[str]):
+        """Build a GenerationConfig, requesting constrained decoding if set"""
+        if response_mime_type:
+            return genai.types.GenerationConfig(
+                temperature=temperature,
+                response_mime_type=response_mime_type
+            )
+        return genai.types.GenerationConfig(temperature=temperature)
+
     def get_completion(
         self, 
         prompt: str, 
         system_instruction: Optional[str] = None,
         temperature: float = 0.7,
-        max_retries: int = 3
+        max_retries: int = 3,
+        cache_system: bool = True,
+        response_mime_type: Optional[str] = None
     ) -> str:
         """
         Get completion from Gemini with retry logic
-        
+
         Args:
             prompt: User prompt
             system_instruction: System instruction for the model
             temperature: Sampling temperature (0.0 to 1.0)
             max_retries: Number of retries on failure
-            
+            cache_system: Cache the system instruction provider-side
+            response_mime_type: Output MIME type (e.g. "application/json"
+                for constrained JSON decoding)
+
         Returns:
             Model response as string
         """
+        # Coalesce identical concurrent completions: followers wait for
+        # the leader's result instead of issuing a duplicate LLM call
+        key = self._completion_key(prompt, system_instruction, temperature, response_mime_type)
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._get_completion_uncoalesced(
+                prompt, system_instruction, temperature, max_retries,
+                cache_system, response_mime_type
+            )
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _completion_key(
+        self,
+        prompt: str,
+        system_instruction: Optional[str],
+        temperature: float,
+        response_mime_type: Optional[str] = None
+    ) -> str:
+        """Build the hash key identifying a completion request"""
+        return hashlib.sha256(
+            f"{self.model_name}|{system_instruction or ''}|{temperature}|"
+            f"{response_mime_type or ''}|{prompt}".encode("utf-8")
+        ).hexdigest()
+
+    def _get_completion_uncoalesced(
+        self,
+        prompt: str,
+        system_instruction: Optional[str],
+        temperature: float,
+        max_retries: int,
+        cache_system: bool,
+        response_mime_type: Optional[str] = None
+    ) -> str:
+        """Issue the completion call with retry logic (no coalescing)"""
         for attempt in range(max_retries):
             try:
-                generation_config = genai.types.GenerationConfig(
-                    temperature=temperature,
+                generation_config = self._generation_config(
+                    temperature, response_mime_type
                 )
-                
-                if system_instruction:
-                    model = genai.GenerativeModel(
-                        model_name=self.model_name,
-                        system_instruction=system_instruction
-                    )
-                else:
-                    model = self.model
-                
+
+                model = self._get_model(system_instruction, cache_system)
+
                 response = model.generate_content(
                     prompt,
-                    generation_config=generation_config
+                    generation_config=generation_config,
+                    request_options=self._request_options
                 )
-                
+
+                self._record_usage(response)
                 return response.text
                 
+            except NON_RETRYABLE_EXCEPTIONS as e:
+                # Expired provider-side cached content surfaces here as
+                # NotFound/PermissionDenied; drop the stale handle and redo
+                # the call on a plain model instead of failing every
+                # request until restart. The rebuilt handle is not
+                # cache-backed, so this recurses at most once.
+                if self._evict_cached_model(system_instruction):
+                    return self._get_completion_uncoalesced(
+                        prompt, system_instruction, temperature,
+                        max_retries, False, response_mime_type
+                    )
+                # Bad request / auth / missing resource - retrying can't help
+                raise Exception(f"LLM call failed (non-retryable): {str(e)}") from e
             except Exception as e:
+                # With the taxonomy loaded, only transient provider errors
+                # and generic network failures are worth retrying; anything
+                # else is deterministic and fails fast. Without it (import
+                # failed), every unclassified error is retried as before.
+                if RETRYABLE_EXCEPTIONS and not isinstance(
+                    e, RETRYABLE_EXCEPTIONS + (ConnectionError, TimeoutError)
+                ):
+                    raise Exception(f"LLM call failed (non-retryable): {str(e)}") from e
                 if attempt == max_retries - 1:
                     raise Exception(f"LLM call failed after {max_retries} attempts: {str(e)}")
-                time.sleep(2 ** attempt)  # Exponential backoff
+                time.sleep(self._backoff_delay(attempt))
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Capped exponential backoff with full jitter
+
+        Args:
+            attempt: Zero-based retry attempt number
+
+        Returns:
+            Delay in seconds
+        """
+        ceiling = min(self._retry_max_backoff, self._retry_base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
                 
-    def get_json_completion(
+    def stream_completion(
+        self,
+        prompt: str,
+        system_instruction: Optional[str] = None,
+        temperature: float = 0.7,
+        cache_system: bool = True,
+        response_mime_type: Optional[str] = None
+    ):
+        """
+        Stream completion text from Gemini chunk by chunk
+
+        Args:
+            prompt: User prompt
+            system_instruction: System instruction for the model
+            temperature: Sampling temperature (0.0 to 1.0)
+            cache_system: Cache the system instruction provider-side
+            response_mime_type: Output MIME type for constrained decoding
+
+        Yields:
+            Response text chunks as they are generated
+        """
+        generation_config = self._generation_config(temperature, response_mime_type)
+
+        model = self._get_model(system_instruction, cache_system)
+
+        response = model.generate_content(
+            prompt,
+            generation_config=generation_config,
+            request_options=self._request_options,
+            stream=True
+        )
+
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                continue
+            if text:
+                yield text
+
+        self._record_usage(response)
+
+    def stream_json_completion(
         self,
         prompt: str,
         system_instruction: Optional[str] = None,
         temperature: float = 0.3
+    ):
+        """
+        Stream a JSON completion from Gemini chunk by chunk
+
+        The raw JSON text is yielded incrementally; callers accumulate the
+        chunks and parse with parse_json_response once the stream ends.
+
+        Args:
+            prompt: User prompt (should request JSON output)
+            system_instruction: System instruction
+            temperature: Lower temperature for more consistent JSON
+
+        Yields:
+            Raw JSON text chunks
+        """
+        # Constrained decoding guarantees syntactically valid JSON, so no
+        # "respond only with JSON" prompt padding is needed
+        yield from self.stream_completion(
+            prompt,
+            system_instruction=system_instruction,
+            temperature=temperature,
+            response_mime_type="application/json"
+        )
+
+    def start_session(
+        self,
+        system_instruction: Optional[str] = None,
+        cache_system: bool = True
+    ):
+        """
+        Start a multi-turn chat session
+
+        Turns sent on the same session share server-side context, so the
+        system instruction and earlier turns are not re-processed on each
+        call - useful when the planner and verifier run back to back on
+        one task.
+
+        Args:
+            system_instruction: System instruction for the session
+            cache_system: Cache the system instruction provider-side
+
+        Returns:
+            ChatSession instance
+        """
+        model = self._get_model(system_instruction, cache_system)
+        return model.start_chat(history=[])
+
+    def send_json_message(
+        self,
+        session,
+        prompt: str,
+        temperature: float = 0.3
+    ) -> Dict[str, Any]:
+        """
+        Send a message on a chat session and parse the JSON reply
+
+        Args:
+            session: ChatSession from start_session
+            prompt: User prompt
+            temperature: Lower temperature for more consistent JSON
+
+        Returns:
+            Parsed JSON response as dictionary
+        """
+        response = session.send_message(
+            prompt,
+            generation_config=self._generation_config(temperature, "application/json"),
+            request_options=self._request_options
+        )
+        self._record_usage(response)
+        return self.parse_json_response(response.text)
+
+    def get_json_completion(
+        self,
+        prompt: str,
+        system_instruction: Optional[str] = None,
+        temperature: float = 0.3,
+        cache_system: bool = True
     ) -> Dict[str, Any]:
         """
         Get structured JSON completion from Gemini
-        
+
         Args:
             prompt: User prompt (should request JSON output)
             system_instruction: System instruction
             temperature: Lower temperature for more consistent JSON
-            
+            cache_system: Cache the system instruction provider-side
+
         Returns:
             Parsed JSON response as dictionary
         """
-        # Add JSON formatting instruction to prompt
-        json_prompt = f"""{prompt}
+        # Identical planner/verifier prompts recur across tasks; serving
+        # them from a TTL cache skips the model call entirely
+        cache_key = None
+        if self._json_cache_ttl > 0:
+            cache_key = self._completion_key(prompt, system_instruction, temperature)
+            cached = self._json_cache_get(cache_key)
+            if cached is not None:
+                return cached
 
-IMPORTANT: Respond ONLY with valid JSON. No markdown, no explanations, just the JSON object."""
-        
-        if system_instruction:
-            system_instruction += "\nYou must respond with valid JSON only."
-        else:
-            system_instruction = "You must respond with valid JSON only."
-        
+        # Constrained decoding replaces the old "respond only with JSON"
+        # prompt padding: fewer input tokens and no markdown fences to strip
         response = self.get_completion(
-            json_prompt,
+            prompt,
             system_instruction=system_instruction,
-            temperature=temperature
+            temperature=temperature,
+            cache_system=cache_system,
+            response_mime_type="application/json"
         )
         
         # Try to parse JSON from response
-        return self.parse_json_response(response)
+        parsed = self.parse_json_response(response)
+
+        if cache_key is not None:
+            self._json_cache_store(cache_key, parsed)
+
+        return parsed
+
+    def _json_cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached JSON completion if present and not expired"""
+        with self._json_cache_lock:
+            entry = self._json_cache.get(key)
+            if entry is None:
+                return None
+            timestamp, result = entry
+            if time.time() - timestamp > self._json_cache_ttl:
+                del self._json_cache[key]
+                return None
+            self._json_cache.move_to_end(key)
+            # Deep copy so callers can't mutate the cached value
+            return copy.deepcopy(result)
+
+    def _json_cache_store(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a parsed JSON completion, evicting the oldest on overflow"""
+        with self._json_cache_lock:
+            self._json_cache[key] = (time.time(), copy.deepcopy(result))
+            self._json_cache.move_to_end(key)
+            while len(self._json_cache) > self.JSON_CACHE_MAX_ENTRIES:
+                self._json_cache.popitem(last=False)
     
     def parse_json_response(self, response: str) -> Dict[str, Any]:
         """
@@ -133,24 +547,34 @@ IMPORTANT: Respond ONLY with valid JSON. No markdown, no explanations, just the
         try:
             return json.loads(cleaned)
         except json.JSONDecodeError as e:
-            # Try to find JSON object in the response
-            import re
-            json_match = re.search(r'\{.*\}', cleaned, re.DOTALL)
-            if json_match:
+            # Slice out the outermost brace span - a linear find/rfind scan
+            # instead of a backtracking DOTALL regex over the whole response
+            start = cleaned.find("{")
+            end = cleaned.rfind("}")
+            if 0 <= start < end:
                 try:
-                    return json.loads(json_match.group())
-                except:
+                    return json.loads(cleaned[start:end + 1])
+                except json.JSONDecodeError:
                     pass
             raise ValueError(f"Failed to parse JSON from response: {e}\nResponse: {response}")
 
 
 # Singleton instance
 _llm_client: Optional[LLMClient] = None
+_llm_client_lock = threading.Lock()
 
 
 def get_llm_client() -> LLMClient:
-    """Get or create singleton LLM client instance"""
+    """
+    Get or create singleton LLM client instance
+
+    Double-checked locking: concurrent executor threads racing through
+    first use construct exactly one client (and run genai.configure's
+    side effects exactly once); steady-state calls skip the lock.
+    """
     global _llm_client
     if _llm_client is None:
-        _llm_client = LLMClient()
+        with _llm_client_lock:
+            if _llm_client is None:
+                _llm_client = LLMClient()
     return _llm_client
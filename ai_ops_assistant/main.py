@@ -3,12 +3,64 @@ Main Orchestrator
 Coordinates Planner, Executor, and Verifier agents
 """
 import os
-import json
+import re
+import sys
+import logging
 from typing import Dict, Any
-from dotenv import load_dotenv
 
-from agents import PlannerAgent, ExecutorAgent, VerifierAgent
-from tools import initialize_tools
+logger = logging.getLogger("aiops")
+
+# Banner separator for CLI output, computed once
+SEP = "=" * 60
+
+try:
+    import orjson
+
+    def dumps_result(result: Dict[str, Any]) -> str:
+        """Serialize a result payload with orjson (C-level encoder)"""
+        return orjson.dumps(
+            result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+except ImportError:
+    import json
+
+    def dumps_result(result: Dict[str, Any]) -> str:
+        """Fallback serializer when orjson is not installed"""
+        return json.dumps(result, indent=2)
+
+
+def setup_logging() -> None:
+    """
+    Configure queue-based logging for CLI runs
+
+    Records pass through a QueueHandler to a listener thread, so
+    formatting and stream I/O happen off the request path; a skipped
+    record costs one level check. No-op when handlers already exist
+    (e.g. when the API server configured logging first).
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return
+
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+    )
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+    QueueListener(log_queue, stream_handler).start()
+
+
+def load_env() -> None:
+    """Load .env variables, skipping the file read when already configured"""
+    if os.getenv("GOOGLE_API_KEY"):
+        return
+    from dotenv import load_dotenv
+    load_dotenv()
 
 
 class AIOperationsAssistant:
@@ -19,20 +71,52 @@ class AIOperationsAssistant:
     
     def __init__(self):
         """Initialize the assistant and all agents"""
+        # Agent imports deferred to keep `python main.py` cold start (help
+        # text, missing-key errors) free of the SDK import tree
+        from agents import PlannerAgent, ExecutorAgent, VerifierAgent
+        from agents.verifier import VERIFIER_SYSTEM_INSTRUCTION
+        from tools import initialize_tools
+
         # Load environment variables
-        load_dotenv()
+        load_env()
         
         # Initialize tools registry
-        print("[System] Initializing tools...")
+        logger.info("Initializing tools...")
         self.tool_registry = initialize_tools()
         
         # Initialize agents
-        print("[System] Initializing agents...")
+        logger.info("Initializing agents...")
         self.planner = PlannerAgent()
         self.executor = ExecutorAgent()
         self.verifier = VerifierAgent()
         
-        print("[System] AI Operations Assistant ready!")
+        # High-confidence single-tool intents planned without the LLM:
+        # (pattern, plan builder) pairs tried in order before the planner
+        self._fast_router = [
+            (
+                re.compile(
+                    r"(?i)^\s*(?!.*\b(?:and|then|also)\b)"
+                    r"(?:what(?:'s| is) the )?weather(?: like)? in ([A-Za-z .'-]+?)\??\s*$"
+                ),
+                self._route_weather
+            ),
+            (
+                re.compile(
+                    r"(?i)^\s*(?:find |show |list |get )?top (\d{1,2}) ([A-Za-z+#.]+) "
+                    r"(?:repos|repositories)(?: on github)?\??\s*$"
+                ),
+                self._route_repos
+            ),
+        ]
+
+        # Combined instruction for optional per-task chat sessions: one
+        # session serves both the planner and verifier turns, so the shared
+        # prefix is processed once per task instead of once per call
+        self._session_instruction = (
+            self.planner.system_instruction + "\n\n" + VERIFIER_SYSTEM_INSTRUCTION
+        )
+
+        logger.info("AI Operations Assistant ready")
     
     def process_task(self, user_input: str, verbose: bool = True) -> Dict[str, Any]:
         """
@@ -46,63 +130,133 @@ class AIOperationsAssistant:
             Final verified results
         """
         if verbose:
-            print(f"\n{'='*60}")
-            print(f"PROCESSING TASK: {user_input}")
-            print(f"{'='*60}\n")
+            logger.info("Processing task: %s", user_input)
+            logger.info("[1/3] Planning phase")
         
-        # Step 1: Planning
-        if verbose:
-            print("[1/3] PLANNING PHASE")
-            print("-" * 60)
-        
-        plan = self.planner.create_plan(user_input)
+        # One chat session per task keeps the planner turn as server-side
+        # context for the verifier turn (opt-in via LLM_SESSION_REUSE)
+        session = None
+        if os.getenv("LLM_SESSION_REUSE", "").lower() in ("1", "true", "yes"):
+            session = self.planner.llm.start_session(self._session_instruction)
+
+        # Trivially recognizable requests skip the planner LLM round-trip
+        plan = self._route_fast_path(user_input)
+        if plan is None:
+            plan = self.planner.create_plan(user_input, session=session)
         
         if verbose:
-            print(f"Task: {plan.get('task', 'Unknown')}")
-            print(f"Steps planned: {len(plan.get('steps', []))}")
+            logger.info("Task: %s", plan.get('task', 'Unknown'))
+            logger.info("Steps planned: %d", len(plan.get('steps', [])))
             if plan.get('status') == 'error':
-                print(f"Planning error: {plan.get('error')}")
-            else:
+                logger.error("Planning error: %s", plan.get('error'))
+            elif logger.isEnabledFor(logging.INFO):
                 for step in plan.get('steps', []):
-                    print(f"  - Step {step['step_number']}: {step['action']} [{step['tool']}]")
+                    logger.info(
+                        "Step %s: %s [%s]",
+                        step['step_number'], step['action'], step['tool']
+                    )
         
         # Step 2: Execution
         if verbose:
-            print(f"\n[2/3] EXECUTION PHASE")
-            print("-" * 60)
+            logger.info("[2/3] Execution phase")
         
         execution_result = self.executor.execute_plan(plan)
         
-        if verbose:
-            summary = self.executor.get_execution_summary(execution_result)
-            print(summary)
+        if verbose and logger.isEnabledFor(logging.INFO):
+            logger.info("%s", self.executor.get_execution_summary(execution_result))
         
         # Step 3: Verification
         if verbose:
-            print(f"\n[3/3] VERIFICATION PHASE")
-            print("-" * 60)
+            logger.info("[3/3] Verification phase")
         
-        final_result = self.verifier.verify_and_format(plan, execution_result)
+        final_result = self.verifier.verify_and_format(
+            plan, execution_result, session=session
+        )
         
         if verbose:
-            print(f"Status: {final_result.get('status')}")
-            print(f"Completeness: {final_result.get('completeness_score', 0)}%")
-            print(f"\nSummary:\n{final_result.get('summary', 'No summary available')}")
+            logger.info("Status: %s", final_result.get('status'))
+            logger.info("Completeness: %s%%", final_result.get('completeness_score', 0))
+            logger.info("Summary: %s", final_result.get('summary', 'No summary available'))
             
-            if final_result.get('findings'):
-                findings = final_result['findings']
-                if findings.get('key_results'):
-                    print(f"\nKey Results:")
-                    for result in findings['key_results']:
-                        print(f"  • {result}")
-        
-        if verbose:
-            print(f"\n{'='*60}")
-            print("TASK COMPLETED")
-            print(f"{'='*60}\n")
+            findings = final_result.get('findings')
+            if findings and findings.get('key_results') and logger.isEnabledFor(logging.INFO):
+                for result in findings['key_results']:
+                    logger.info("Key result: %s", result)
+            logger.info("Task completed")
         
         return final_result
     
+    def _route_fast_path(self, user_input: str) -> Dict[str, Any]:
+        """
+        Plan a high-confidence single-tool request without the LLM
+
+        The planner round-trip dominates latency for requests like
+        "weather in London"; a tight regex match builds the one-step plan
+        directly. Disable with INTENT_ROUTER=0.
+
+        Args:
+            user_input: Natural language task description
+
+        Returns:
+            Plan dictionary, or None when no rule matches
+        """
+        if os.getenv("INTENT_ROUTER", "1").lower() in ("0", "false", "no"):
+            return None
+
+        for pattern, builder in self._fast_router:
+            match = pattern.search(user_input)
+            if match:
+                plan = builder(match)
+                plan["status"] = "success"
+                plan["routed"] = True
+                return plan
+        return None
+
+    @staticmethod
+    def _route_weather(match) -> Dict[str, Any]:
+        """Build a one-step current-weather plan from a router match"""
+        city = match.group(1).strip().title()
+        return {
+            "task": f"Get current weather for {city}",
+            "steps": [
+                {
+                    "step_number": 1,
+                    "action": f"Get current weather for {city}",
+                    "tool": "weather",
+                    "parameters": {
+                        "action": "current",
+                        "city": city,
+                        "units": "metric"
+                    },
+                    "depends_on": []
+                }
+            ]
+        }
+
+    @staticmethod
+    def _route_repos(match) -> Dict[str, Any]:
+        """Build a one-step repository-search plan from a router match"""
+        limit = int(match.group(1))
+        language = match.group(2)
+        return {
+            "task": f"Find top {limit} {language} repositories on GitHub",
+            "steps": [
+                {
+                    "step_number": 1,
+                    "action": f"Search GitHub for top {language} repositories by stars",
+                    "tool": "github",
+                    "parameters": {
+                        "action": "search_repos",
+                        "query": language,
+                        "language": language,
+                        "sort": "stars",
+                        "limit": limit
+                    },
+                    "depends_on": []
+                }
+            ]
+        }
+
     def process_task_simple(self, user_input: str) -> str:
         """
         Process task and return simple text summary
@@ -120,11 +274,26 @@ class AIOperationsAssistant:
         """Get description of available tools"""
         return self.tool_registry.get_tools_description()
 
+    def warm_up(self) -> None:
+        """
+        Pre-build lazily constructed components
+
+        Run in the background while the user is typing so the first task
+        doesn't pay LLM SDK initialization.
+        """
+        try:
+            self.planner.llm
+            self.verifier.llm
+        except Exception:
+            pass  # Warmup is best-effort; real calls surface real errors
+
 
 def main():
     """Main entry point for CLI usage"""
-    import sys
-    
+    # Load environment variables exactly once, before the key check
+    load_env()
+    setup_logging()
+
     # Check if API keys are set
     if not os.getenv("GOOGLE_API_KEY"):
         print("ERROR: GOOGLE_API_KEY environment variable not set")
@@ -142,49 +311,91 @@ def main():
         result = assistant.process_task(task)
         
         # Print final result as JSON
-        print("\n" + "="*60)
+        print("\n" + SEP)
         print("FINAL RESULT (JSON)")
-        print("="*60)
-        print(json.dumps(result, indent=2))
+        print(SEP)
+        print(dumps_result(result))
     else:
         # Interactive mode
-        print("\n" + "="*60)
+        print("\n" + SEP)
         print("AI OPERATIONS ASSISTANT - Interactive Mode")
-        print("="*60)
+        print(SEP)
         print("\nAvailable tools:")
         print(assistant.get_available_tools())
         print("\nEnter your tasks (type 'exit' to quit):\n")
-        
-        while True:
-            try:
-                user_input = input("\n> ").strip()
-                
-                if user_input.lower() in ['exit', 'quit', 'q']:
-                    print("Goodbye!")
-                    break
-                
-                if not user_input:
-                    continue
-                
-                result = assistant.process_task(user_input)
-                
-            except KeyboardInterrupt:
-                print("\n\nGoodbye!")
+
+        try:
+            import prompt_toolkit  # noqa: F401 - probe for the async REPL
+        except ImportError:
+            interactive_blocking(assistant)
+        else:
+            import asyncio
+            asyncio.run(interactive_async(assistant))
+
+
+async def interactive_async(assistant: AIOperationsAssistant) -> None:
+    """
+    Async interactive REPL
+
+    Uses prompt_toolkit's prompt_async so the event loop stays free while
+    waiting for input - warmup work runs behind human thinking time
+    instead of blocking the first task.
+
+    Args:
+        assistant: Initialized assistant
+    """
+    import asyncio
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.patch_stdout import patch_stdout
+
+    session = PromptSession()
+    warmup = asyncio.create_task(asyncio.to_thread(assistant.warm_up))
+
+    while True:
+        try:
+            with patch_stdout():
+                user_input = (await session.prompt_async("\n> ")).strip()
+        except (EOFError, KeyboardInterrupt):
+            print("\nGoodbye!")
+            break
+
+        if user_input.lower() in ['exit', 'quit', 'q']:
+            print("Goodbye!")
+            break
+
+        if not user_input:
+            continue
+
+        try:
+            # Offload the blocking pipeline so the loop can keep rendering
+            await asyncio.to_thread(assistant.process_task, user_input)
+        except Exception as e:
+            print(f"\nError: {str(e)}")
+
+    warmup.cancel()
+
+
+def interactive_blocking(assistant: AIOperationsAssistant) -> None:
+    """Fallback blocking REPL when prompt_toolkit is unavailable"""
+    while True:
+        try:
+            user_input = input("\n> ").strip()
+
+            if user_input.lower() in ['exit', 'quit', 'q']:
+                print("Goodbye!")
                 break
-            except Exception as e:
-                print(f"\nError: {str(e)}")
+
+            if not user_input:
+                continue
+
+            result = assistant.process_task(user_input)
+
+        except KeyboardInterrupt:
+            print("\n\nGoodbye!")
+            break
+        except Exception as e:
+            print(f"\nError: {str(e)}")
 
 
 if __name__ == "__main__":
-    import sys
-    
-    # Load environment variables FIRST
-    load_dotenv()
-    
-    if len(sys.argv) > 1:
-        task = sys.argv[1]
-        assistant = AIOperationsAssistant()
-        assistant.process_task(task)
-    else:
-        print("Usage: python main.py \"<task_description>\"")
-        print("Example: python main.py \"Find top 3 python repos on GitHub\"")
+    main()
@@ -1,28 +1,33 @@
 """Tools module - API integrations"""
+from ._http import build_http_session, get_session
 from .base_tool import BaseTool, ToolRegistry, get_registry
 from .github_tool import GitHubTool
 from .weather_tool import WeatherTool
 
+
 # Initialize and register all tools
 def initialize_tools():
     """Initialize and register all available tools"""
     registry = get_registry()
-    
+    session = get_session()
+
     # Register GitHub tool
-    github_tool = GitHubTool()
+    github_tool = GitHubTool(session=session)
     registry.register(github_tool)
-    
+
     # Register Weather tool
-    weather_tool = WeatherTool()
+    weather_tool = WeatherTool(session=session)
     registry.register(weather_tool)
-    
+
     return registry
 
 __all__ = [
     'BaseTool',
-    'ToolRegistry', 
+    'ToolRegistry',
     'get_registry',
     'GitHubTool',
     'WeatherTool',
+    'build_http_session',
+    'get_session',
     'initialize_tools'
 ]
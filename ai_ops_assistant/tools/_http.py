@@ -0,0 +1,147 @@
+"""
+Process-wide HTTP session shared by all tools
+
+Tools may be re-instantiated per request or created outside
+initialize_tools(); each private session would carry its own connection
+pool and defeat keep-alive reuse. This module owns one pooled session
+for the whole process - requests.Session pools per host internally, so
+a single session serves both the GitHub and weather origins.
+"""
+import os
+import atexit
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def _accept_encoding() -> str:
+    """
+    Accept-Encoding value matching the decoders actually installed
+
+    Brotli shrinks the JSON bodies GitHub serves another ~20% over gzip,
+    but urllib3 can only decode it when a brotli package is present -
+    advertising it without a decoder would corrupt responses.
+    """
+    try:
+        import brotli  # noqa: F401 - probe only
+        return "br, gzip, deflate"
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401 - probe only
+            return "br, gzip, deflate"
+        except ImportError:
+            return "gzip, deflate"
+
+
+def build_http_session() -> requests.Session:
+    """
+    Build the pooled HTTP session shared by all tools
+
+    One session means TCP+TLS connections are reused across tool calls
+    instead of each request paying connection setup, with transient
+    gateway errors retried at the transport level.
+
+    With TOOL_HTTP2 enabled (and httpx installed), an httpx.Client with
+    HTTP/2 is returned instead: concurrent tool calls multiplex over a
+    single TLS connection rather than holding one socket each. The
+    client mirrors the Session surface the tools use (get/post/close).
+    """
+    if os.getenv("TOOL_HTTP2", "").lower() in ("1", "true", "yes"):
+        try:
+            import httpx
+            # follow_redirects matches requests.Session behavior - httpx
+            # does not follow redirects by default, and GitHub answers
+            # renamed-repo lookups with a 301
+            return httpx.Client(
+                http2=True,
+                timeout=10.0,
+                follow_redirects=True,
+                transport=httpx.HTTPTransport(retries=3)
+            )
+        except ImportError:
+            pass  # httpx[http2] not installed - keep the requests pool
+
+    session = requests.Session()
+    # Compressed transfer: 5-30 KB JSON bodies shrink several-fold on
+    # the wire; decoding happens transparently in urllib3
+    session.headers["Accept-Encoding"] = _accept_encoding()
+    # Pool sized for the executor's thread fan-out: below the worker
+    # count, urllib3 silently discards sockets above the pool size and
+    # every extra call pays TCP+TLS setup again. pool_block stays False
+    # so bursts degrade to new connections instead of queueing.
+    pool_size = int(os.getenv("TOOL_POOL_SIZE", "32"))
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def http_error_details(error) -> dict:
+    """
+    Extract retry-relevant details from an HTTP error
+
+    The executor's retry loop stops on 4xx status codes (other than 429)
+    and honors Retry-After hints, but only if tool error dicts carry
+    them - merge the returned mapping into the error result.
+
+    Args:
+        error: requests.HTTPError (or httpx.HTTPStatusError) instance
+
+    Returns:
+        Dict with 'status_code' and 'retry_after_seconds' when the
+        error carries a response; empty otherwise
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return {}
+
+    details = {"status_code": response.status_code}
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            details["retry_after_seconds"] = float(retry_after)
+        except ValueError:
+            pass  # HTTP-date form - let the normal backoff apply
+    return details
+
+
+# Process-wide session singleton, built on first use
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Get the process-wide pooled HTTP session, building it on first use
+
+    Every caller shares one connection pool, so keep-alive reuse
+    survives tool re-instantiation and cross-tool calls to the same
+    host. Closed automatically at interpreter exit.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_http_session()
+                atexit.register(close_session)
+    return _session
+
+
+def close_session() -> None:
+    """Close the process-wide session; the next get_session() rebuilds it"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
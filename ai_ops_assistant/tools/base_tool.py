@@ -3,33 +3,41 @@ Base Tool Class and Tool Registry
 All tools must inherit from BaseTool
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from types import MappingProxyType
+from typing import ClassVar, Dict, Any, List
 
 
 class BaseTool(ABC):
-    """Abstract base class for all tools"""
-    
-    @property
-    @abstractmethod
-    def name(self) -> str:
-        """Unique name of the tool"""
-        pass
-    
-    @property
-    @abstractmethod
-    def description(self) -> str:
-        """Description of what the tool does"""
-        pass
-    
-    @property
-    @abstractmethod
-    def parameters(self) -> Dict[str, str]:
-        """
-        Dictionary of parameter names and their descriptions
-        Example: {"query": "Search query string", "limit": "Max number of results"}
-        """
-        pass
-    
+    """
+    Abstract base class for all tools
+
+    Subclasses declare three class attributes (checked at class creation):
+      name: unique name of the tool
+      description: description of what the tool does
+      parameters: dict of parameter names and their descriptions,
+          e.g. {"query": "Search query string", "limit": "Max results"}
+
+    Plain class attributes instead of abstract properties: these are
+    constants per tool, and attribute access skips the descriptor call
+    that made them hot in registry/description paths.
+    """
+
+    name: ClassVar[str]
+    description: ClassVar[str]
+    parameters: ClassVar[Dict[str, str]]
+
+    # Whether results may be cached by the executor. Read-only tools keep
+    # the default; tools with side effects must set this to False.
+    cacheable: bool = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for attr in ("name", "description", "parameters"):
+            if getattr(cls, attr, None) is None:
+                raise TypeError(
+                    f"{cls.__name__} must define class attribute '{attr}'"
+                )
+
     @abstractmethod
     def execute(self, **kwargs) -> Dict[str, Any]:
         """
@@ -40,48 +48,107 @@ class BaseTool(ABC):
         """
         pass
     
+    async def aexecute(self, **kwargs) -> Dict[str, Any]:
+        """
+        Async counterpart of execute
+
+        The default offloads the blocking execute to a worker thread.
+        I/O-bound tools override this with a native async path so the
+        orchestrator can fan out N calls with asyncio.gather and pay
+        ~one round trip of wall time instead of N.
+
+        Returns:
+            Dictionary with execution results
+        """
+        import asyncio
+        return await asyncio.to_thread(self.execute, **kwargs)
+
+    def warmup(self) -> None:
+        """
+        Prepare the tool for imminent use
+
+        Called when a plan step naming this tool is spotted while the plan
+        is still streaming. Default is a no-op; tools that benefit from
+        preconnecting (HTTP sessions, auth handshakes) override it.
+        """
+
     def to_dict(self) -> Dict[str, Any]:
-        """Convert tool to dictionary representation"""
-        return {
-            "name": self.name,
-            "description": self.description,
-            "parameters": self.parameters
-        }
+        """
+        Convert tool to dictionary representation
+
+        Name, description and parameters are constant per tool, so the
+        dict is built once and exposed as a read-only mapping - repeat
+        calls are a single attribute lookup instead of three property
+        calls plus a dict allocation.
+        """
+        cached = getattr(self, "_cached_dict", None)
+        if cached is None:
+            cached = MappingProxyType({
+                "name": self.name,
+                "description": self.description,
+                "parameters": dict(self.parameters)
+            })
+            self._cached_dict = cached
+        return cached
 
 
 class ToolRegistry:
     """Registry to manage all available tools"""
-    
+
+    # Fixed attribute layout: no per-instance __dict__, slightly faster
+    # attribute access in the lookup hot path
+    __slots__ = ("_tools", "_tools_description", "_tools_dict")
+
     def __init__(self):
         self._tools: Dict[str, BaseTool] = {}
-    
+        self._tools_description: str = None
+        self._tools_dict: List[Dict[str, Any]] = None
+
     def register(self, tool: BaseTool) -> None:
         """Register a new tool"""
         self._tools[tool.name] = tool
-    
+        # Invalidate memoized views on registry change
+        self._tools_description = None
+        self._tools_dict = None
+
+    def unregister(self, name: str) -> None:
+        """Remove a tool from the registry"""
+        self._tools.pop(name, None)
+        self._tools_description = None
+        self._tools_dict = None
+
     def get_tool(self, name: str) -> BaseTool:
         """Get tool by name"""
         if name not in self._tools:
             raise ValueError(f"Tool '{name}' not found in registry")
         return self._tools[name]
-    
+
     def get_all_tools(self) -> List[BaseTool]:
         """Get list of all registered tools"""
         return list(self._tools.values())
-    
+
+    def list_tools(self) -> List[str]:
+        """Get names of all registered tools"""
+        return list(self._tools.keys())
+
     def get_tools_description(self) -> str:
-        """Get formatted description of all tools for LLM"""
-        descriptions = []
-        for tool in self._tools.values():
-            params_str = ", ".join([f"{k}: {v}" for k, v in tool.parameters.items()])
-            descriptions.append(
-                f"- {tool.name}: {tool.description}\n  Parameters: {params_str}"
-            )
-        return "\n".join(descriptions)
+        """Get formatted description of all tools for LLM (memoized)"""
+        if self._tools_description is None:
+            descriptions = []
+            for tool in self._tools.values():
+                params_str = ", ".join([f"{k}: {v}" for k, v in tool.parameters.items()])
+                descriptions.append(
+                    f"- {tool.name}: {tool.description}\n  Parameters: {params_str}"
+                )
+            self._tools_description = "\n".join(descriptions)
+        return self._tools_description
     
     def get_tools_dict(self) -> List[Dict[str, Any]]:
-        """Get all tools as list of dictionaries"""
-        return [tool.to_dict() for tool in self._tools.values()]
+        """Get all tools as list of dictionaries (memoized)"""
+        if self._tools_dict is None:
+            # Plain dict copies so the result serializes directly
+            self._tools_dict = [dict(tool.to_dict()) for tool in self._tools.values()]
+        return self._tools_dict
 
 
 # Global registry instance
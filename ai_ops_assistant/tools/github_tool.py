@@ -2,48 +2,340 @@
 GitHub Tool for repository search and information retrieval
 """
 import os
+import math
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
-from github import Github, GithubException
 import requests
+from ._http import get_session, http_error_details
 from .base_tool import BaseTool
 
+try:
+    # orjson parses payloads several times faster than stdlib json
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    import json
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        """Fallback serializer when orjson is not installed"""
+        return json.dumps(obj).encode()
+
+
+GITHUB_API_URL = "https://api.github.com"
+
+
+# Populated by _load_pygithub() on first use. PyGithub drags in a heavy
+# dependency tree (cryptography, pyjwt, ...) at import time, and only the
+# unauthenticated user-info fallback still needs it - importing the tools
+# package shouldn't pay for it.
+Github = None
+GithubException = ()
+
+
+def _load_pygithub() -> None:
+    """Import PyGithub and populate the module-level names"""
+    global Github, GithubException
+    if Github is None:
+        from github import Github as _Github, GithubException as _GithubException
+        Github, GithubException = _Github, _GithubException
+
+
+# GraphQL selections covering exactly the fields the result schemas use -
+# one POST replaces the full REST payload (plus the extra topics call)
+REPO_INFO_QUERY = """query($o: String!, $n: String!) {
+  repository(owner: $o, name: $n) {
+    name nameWithOwner description stargazerCount forkCount
+    watchers { totalCount }
+    primaryLanguage { name }
+    createdAt updatedAt url
+    owner { login }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    issues(states: OPEN) { totalCount }
+  }
+}"""
+
+USER_INFO_QUERY = """query($u: String!) {
+  user(login: $u) {
+    login name bio company location email
+    repositories(privacy: PUBLIC) { totalCount }
+    followers { totalCount }
+    following { totalCount }
+    createdAt url
+  }
+}"""
+
 
 class GitHubTool(BaseTool):
     """Tool for interacting with GitHub API"""
-    
-    def __init__(self, token: Optional[str] = None):
+
+    # Bound on the ETag revalidation cache (url+params -> etag, payload)
+    ETAG_CACHE_MAX_ENTRIES = 512
+
+    # When the remaining request budget drops below this, new calls are
+    # answered from cache (or fail fast) instead of burning a round trip
+    # on a guaranteed 403
+    RATELIMIT_MIN_REMAINING = 10
+
+    name = "github"
+    description = "Search GitHub repositories, get repository details, stars, and descriptions"
+    parameters = {
+        "action": "Action to perform: 'search_repos', 'get_repo_info', 'get_user_info'",
+        "query": "Search query (for search_repos)",
+        "repo_name": "Repository full name like 'owner/repo' (for get_repo_info)",
+        "username": "GitHub username (for get_user_info)",
+        "language": "Filter by programming language (optional)",
+        "sort": "Sort by: 'stars', 'forks', 'updated' (default: stars)",
+        "limit": "Maximum number of results (default: 5)"
+    }
+
+    def __init__(self, token: Optional[str] = None, session: Optional[requests.Session] = None):
         """
         Initialize GitHub tool
         
         Args:
             token: GitHub personal access token (optional, for higher rate limits)
+            session: Shared pooled HTTP session for direct REST calls
+                (PyGithub manages its own transport); defaults to the
+                process-wide pool
         """
         self.token = token or os.getenv("GITHUB_TOKEN")
-        if self.token:
-            self.github = Github(self.token)
-        else:
-            self.github = Github()  # Anonymous access with lower rate limits
-    
-    @property
-    def name(self) -> str:
-        return "github"
-    
-    @property
-    def description(self) -> str:
-        return "Search GitHub repositories, get repository details, stars, and descriptions"
-    
+        self.session = session or get_session()
+        # aiohttp session for the async path, created lazily inside a
+        # running event loop
+        self._aio_session = None
+        # ETag cache for REST GETs: a repeat request revalidates with
+        # If-None-Match and a 304 serves the stored payload - no body
+        # download, no JSON parse, and no charge against the rate limit.
+        # Locked because parallel plan steps and _search_repos's page
+        # fan-out hit it from multiple threads.
+        self._etag_cache: OrderedDict = OrderedDict()
+        self._etag_lock = threading.Lock()
+        # Rate-limit budget observed on the last response; None until the
+        # first call has reported the X-RateLimit-* headers
+        self._ratelimit_remaining = None
+        self._ratelimit_reset = 0.0
+        # PyGithub client built lazily by the `github` property
+        self._github = None
+        # Action dispatch table, built once instead of an if/elif chain
+        # re-compared on every execute call
+        self._actions = {
+            "search_repos": self._search_repos,
+            "get_repo_info": self._get_repo_info,
+            "get_user_info": self._get_user_info
+        }
+
     @property
-    def parameters(self) -> Dict[str, str]:
+    def github(self):
+        """PyGithub client, created (and the library imported) on first use"""
+        if self._github is None:
+            _load_pygithub()
+            if self.token:
+                self._github = Github(self.token)
+            else:
+                self._github = Github()  # Anonymous access with lower rate limits
+        return self._github
+
+
+    def _rest_headers(self) -> Dict[str, str]:
+        """Headers for direct REST calls (kept per-request; the session is shared)"""
+        headers = {"Accept": "application/vnd.github+json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def _update_ratelimit(self, headers) -> None:
+        """Record the rate-limit budget reported by a response"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            self._ratelimit_remaining = int(remaining)
+            self._ratelimit_reset = float(headers.get("X-RateLimit-Reset", 0))
+        except ValueError:
+            pass  # Malformed headers - keep the last known budget
+
+    def _ratelimit_exhausted(self) -> bool:
+        """Whether the observed budget is too low to spend on a new call"""
+        return (
+            self._ratelimit_remaining is not None
+            and self._ratelimit_remaining < self.RATELIMIT_MIN_REMAINING
+            and time.time() < self._ratelimit_reset
+        )
+
+    def _get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        GET a REST endpoint with ETag revalidation
+
+        GitHub returns strong ETags on repo, user and search responses.
+        Repeat requests send If-None-Match; a 304 Not Modified carries no
+        body, so the cached parsed payload is returned without another
+        download or JSON parse.
+
+        Args:
+            url: Full request URL
+            params: Optional query parameters
+
+        Returns:
+            Parsed JSON payload
+
+        Raises:
+            requests.HTTPError: On non-2xx/304 responses
+        """
+        key = (url, tuple(sorted(params.items()))) if params else url
+        with self._etag_lock:
+            etag, cached = self._etag_cache.get(key, (None, None))
+
+        # Don't burn a round trip on a guaranteed 403: serve the cached
+        # payload (possibly stale) or fail fast until the window resets
+        if self._ratelimit_exhausted():
+            if cached is not None:
+                return cached
+            raise requests.HTTPError(
+                "GitHub rate limit nearly exhausted; resets in "
+                f"{max(0, int(self._ratelimit_reset - time.time()))}s"
+            )
+
+        headers = self._rest_headers()
+        if etag:
+            headers["If-None-Match"] = etag
+
+        response = self.session.get(url, params=params, headers=headers)
+        self._update_ratelimit(response.headers)
+        if response.status_code == 304:
+            with self._etag_lock:
+                if key in self._etag_cache:
+                    self._etag_cache.move_to_end(key)
+            return cached
+        response.raise_for_status()
+
+        data = _json_loads(response.content)
+        new_etag = response.headers.get("ETag")
+        if new_etag:
+            with self._etag_lock:
+                self._etag_cache[key] = (new_etag, data)
+                self._etag_cache.move_to_end(key)
+                while len(self._etag_cache) > self.ETAG_CACHE_MAX_ENTRIES:
+                    self._etag_cache.popitem(last=False)
+        return data
+
+    @staticmethod
+    def _repo_item_to_dict(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a REST repository item onto the result schema"""
         return {
-            "action": "Action to perform: 'search_repos', 'get_repo_info', 'get_user_info'",
-            "query": "Search query (for search_repos)",
-            "repo_name": "Repository full name like 'owner/repo' (for get_repo_info)",
-            "username": "GitHub username (for get_user_info)",
-            "language": "Filter by programming language (optional)",
-            "sort": "Sort by: 'stars', 'forks', 'updated' (default: stars)",
-            "limit": "Maximum number of results (default: 5)"
+            "name": item["name"],
+            "full_name": item["full_name"],
+            "description": item["description"],
+            "stars": item["stargazers_count"],
+            "forks": item["forks_count"],
+            "language": item["language"],
+            "url": item["html_url"],
+            "owner": item["owner"]["login"]
         }
-    
+
+    def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute one GraphQL query via the shared session
+
+        Args:
+            query: GraphQL query string
+            variables: Query variables
+
+        Returns:
+            The response's data object
+
+        Raises:
+            requests.HTTPError: On transport or GraphQL-level errors
+        """
+        response = self.session.post(
+            f"{GITHUB_API_URL}/graphql",
+            data=_json_dumps({"query": query, "variables": variables}),
+            headers={**self._rest_headers(), "Content-Type": "application/json"}
+        )
+        self._update_ratelimit(response.headers)
+        response.raise_for_status()
+        payload = _json_loads(response.content)
+        if payload.get("errors"):
+            raise requests.HTTPError(
+                f"GraphQL error: {payload['errors'][0].get('message')}"
+            )
+        return payload["data"]
+
+    async def _aio(self):
+        """Get the lazily created aiohttp session for async calls"""
+        if self._aio_session is None or self._aio_session.closed:
+            import aiohttp
+            self._aio_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+            )
+        return self._aio_session
+
+    async def aclose(self) -> None:
+        """Close the async HTTP session"""
+        if self._aio_session is not None and not self._aio_session.closed:
+            await self._aio_session.close()
+
+    async def aexecute(self, **kwargs) -> Dict[str, Any]:
+        """
+        Async GitHub lookup
+
+        search_repos goes through the REST search endpoint over aiohttp
+        (PyGithub is sync-only); other actions fall back to the threaded
+        default.
+
+        Returns:
+            Dictionary with execution results
+        """
+        if kwargs.get("action", "search_repos") != "search_repos":
+            return await super().aexecute(**kwargs)
+
+        try:
+            return await self._asearch_repos(**kwargs)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error executing GitHub tool: {str(e)}"
+            }
+
+    async def _asearch_repos(self, **kwargs) -> Dict[str, Any]:
+        """Search repositories asynchronously via the REST API"""
+        query = kwargs.get("query", "")
+        language = kwargs.get("language")
+        sort = kwargs.get("sort", "stars")
+        limit = int(kwargs.get("limit", 5))
+
+        if not query:
+            return {"success": False, "error": "Query parameter is required"}
+
+        search_query = query
+        if language:
+            search_query += f" language:{language}"
+
+        params = {"q": search_query, "sort": sort, "per_page": limit}
+
+        session = await self._aio()
+        async with session.get(
+            f"{GITHUB_API_URL}/search/repositories",
+            params=params,
+            headers=self._rest_headers()
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+
+        results = [self._repo_item_to_dict(item) for item in data.get("items", [])[:limit]]
+
+        return {
+            "success": True,
+            "action": "search_repos",
+            "query": query,
+            "count": len(results),
+            "repositories": results
+        }
+
     def execute(self, **kwargs) -> Dict[str, Any]:
         """
         Execute GitHub tool action
@@ -56,24 +348,33 @@ class GitHubTool(BaseTool):
             Dictionary with execution results
         """
         action = kwargs.get("action", "search_repos")
-        
+
+        handler = self._actions.get(action)
+        if handler is None:
+            return {
+                "success": False,
+                "error": f"Unknown action: {action}"
+            }
+
+        # Separate clauses: GithubException is a flat empty tuple until
+        # PyGithub is loaded, which except accepts but a nested tuple
+        # would not
         try:
-            if action == "search_repos":
-                return self._search_repos(**kwargs)
-            elif action == "get_repo_info":
-                return self._get_repo_info(**kwargs)
-            elif action == "get_user_info":
-                return self._get_user_info(**kwargs)
-            else:
-                return {
-                    "success": False,
-                    "error": f"Unknown action: {action}"
-                }
-        except GithubException as e:
+            return handler(**kwargs)
+        except requests.HTTPError as e:
             return {
+                "success": False,
+                "error": f"GitHub API error: {str(e)}",
+                **http_error_details(e)
+            }
+        except GithubException as e:
+            result = {
                 "success": False,
                 "error": f"GitHub API error: {str(e)}"
             }
+            if getattr(e, "status", None):
+                result["status_code"] = e.status
+            return result
         except Exception as e:
             return {
                 "success": False,
@@ -81,7 +382,13 @@ class GitHubTool(BaseTool):
             }
     
     def _search_repos(self, **kwargs) -> Dict[str, Any]:
-        """Search GitHub repositories"""
+        """
+        Search GitHub repositories
+
+        A single REST call against /search/repositories through the shared
+        keep-alive session; PyGithub's PaginatedList issued one request
+        per page and one per lazy attribute batch.
+        """
         query = kwargs.get("query", "")
         language = kwargs.get("language")
         sort = kwargs.get("sort", "stars")
@@ -95,25 +402,34 @@ class GitHubTool(BaseTool):
         if language:
             search_query += f" language:{language}"
         
-        # Search repositories
-        repositories = self.github.search_repositories(
-            query=search_query,
-            sort=sort
-        )
-        
-        # Get top results
-        results = []
-        for repo in repositories[:limit]:
-            results.append({
-                "name": repo.name,
-                "full_name": repo.full_name,
-                "description": repo.description,
-                "stars": repo.stargazers_count,
-                "forks": repo.forks_count,
-                "language": repo.language,
-                "url": repo.html_url,
-                "owner": repo.owner.login
-            })
+        # The search API caps per_page at 100; larger limits are fetched
+        # as concurrent page requests instead of sequential ones
+        per_page = min(limit, 100)
+        pages = math.ceil(limit / per_page)
+
+        def fetch_page(page: int) -> List[Dict[str, Any]]:
+            data = self._get_json(
+                f"{GITHUB_API_URL}/search/repositories",
+                params={
+                    "q": search_query,
+                    "sort": sort,
+                    "per_page": per_page,
+                    "page": page
+                }
+            )
+            return data.get("items", [])
+
+        if pages == 1:
+            items = fetch_page(1)
+        else:
+            with ThreadPoolExecutor(max_workers=min(pages, 8)) as pool:
+                items = [
+                    item
+                    for page_items in pool.map(fetch_page, range(1, pages + 1))
+                    for item in page_items
+                ]
+
+        results = [self._repo_item_to_dict(item) for item in items[:limit]]
         
         return {
             "success": True,
@@ -124,31 +440,65 @@ class GitHubTool(BaseTool):
         }
     
     def _get_repo_info(self, **kwargs) -> Dict[str, Any]:
-        """Get detailed information about a specific repository"""
+        """
+        Get detailed information about a specific repository
+
+        One REST call: with the github+json media type the topics list
+        ships inline, so no second get_topics() request is needed.
+        """
         repo_name = kwargs.get("repo_name")
         
         if not repo_name:
             return {"success": False, "error": "repo_name parameter is required"}
         
-        repo = self.github.get_repo(repo_name)
+        # GraphQL requires auth; with a token one small POST returns only
+        # the selected fields instead of the full REST payload
+        if self.token and "/" in repo_name:
+            owner, name = repo_name.split("/", 1)
+            repo = self._graphql(REPO_INFO_QUERY, {"o": owner, "n": name})["repository"]
+            language = repo["primaryLanguage"]
+            return {
+                "success": True,
+                "action": "get_repo_info",
+                "repository": {
+                    "name": repo["name"],
+                    "full_name": repo["nameWithOwner"],
+                    "description": repo["description"],
+                    "stars": repo["stargazerCount"],
+                    "forks": repo["forkCount"],
+                    "watchers": repo["watchers"]["totalCount"],
+                    "language": language["name"] if language else None,
+                    "created_at": repo["createdAt"],
+                    "updated_at": repo["updatedAt"],
+                    "url": repo["url"],
+                    "owner": repo["owner"]["login"],
+                    "topics": [
+                        node["topic"]["name"]
+                        for node in repo["repositoryTopics"]["nodes"]
+                    ],
+                    "open_issues": repo["issues"]["totalCount"]
+                }
+            }
+
+        repo = self._get_json(f"{GITHUB_API_URL}/repos/{repo_name}")
         
         return {
             "success": True,
             "action": "get_repo_info",
             "repository": {
-                "name": repo.name,
-                "full_name": repo.full_name,
-                "description": repo.description,
-                "stars": repo.stargazers_count,
-                "forks": repo.forks_count,
-                "watchers": repo.watchers_count,
-                "language": repo.language,
-                "created_at": repo.created_at.isoformat(),
-                "updated_at": repo.updated_at.isoformat(),
-                "url": repo.html_url,
-                "owner": repo.owner.login,
-                "topics": repo.get_topics(),
-                "open_issues": repo.open_issues_count
+                "name": repo["name"],
+                "full_name": repo["full_name"],
+                "description": repo["description"],
+                "stars": repo["stargazers_count"],
+                "forks": repo["forks_count"],
+                "watchers": repo["watchers_count"],
+                "language": repo["language"],
+                "created_at": repo["created_at"],
+                "updated_at": repo["updated_at"],
+                "url": repo["html_url"],
+                "owner": repo["owner"]["login"],
+                "topics": repo.get("topics", []),
+                "open_issues": repo["open_issues_count"]
             }
         }
     
@@ -159,6 +509,26 @@ class GitHubTool(BaseTool):
         if not username:
             return {"success": False, "error": "username parameter is required"}
         
+        if self.token:
+            user = self._graphql(USER_INFO_QUERY, {"u": username})["user"]
+            return {
+                "success": True,
+                "action": "get_user_info",
+                "user": {
+                    "username": user["login"],
+                    "name": user["name"],
+                    "bio": user["bio"],
+                    "company": user["company"],
+                    "location": user["location"],
+                    "email": user["email"],
+                    "public_repos": user["repositories"]["totalCount"],
+                    "followers": user["followers"]["totalCount"],
+                    "following": user["following"]["totalCount"],
+                    "created_at": user["createdAt"],
+                    "url": user["url"]
+                }
+            }
+
         user = self.github.get_user(username)
         
         return {
@@ -174,7 +544,9 @@ class GitHubTool(BaseTool):
                 "public_repos": user.public_repos,
                 "followers": user.followers,
                 "following": user.following,
-                "created_at": user.created_at.isoformat(),
+                # The API already returns ISO-8601; passing the raw string
+                # through skips PyGithub's datetime parse + re-format
+                "created_at": user.raw_data["created_at"],
                 "url": user.html_url
             }
         }
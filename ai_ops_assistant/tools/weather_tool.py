@@ -3,43 +3,271 @@ Weather Tool for current weather and forecast information
 Uses OpenWeatherMap API
 """
 import os
+import copy
+import time
+import asyncio
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 import requests
+from ._http import get_session, http_error_details
 from .base_tool import BaseTool
 
+try:
+    # orjson parses payloads several times faster than stdlib json
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
 
 class WeatherTool(BaseTool):
     """Tool for getting weather information via OpenWeatherMap API"""
-    
-    def __init__(self, api_key: Optional[str] = None):
+
+    # Weather changes slowly; cached responses skip the HTTP round trip.
+    # Defaults are overridden by the provider's Cache-Control max-age.
+    CACHE_TTLS = {"current": 600, "forecast": 1800}
+    CACHE_MAX_ENTRIES = 256
+
+    name = "weather"
+    description = "Get current weather information and forecasts for any city"
+    parameters = {
+        "action": "Action to perform: 'current', 'forecast', 'current_many' or 'bundle' (current + forecast)",
+        "city": "City name (e.g., 'London', 'New York')",
+        "cities": "List of city names (for current_many)",
+        "country": "Country code (optional, e.g., 'US', 'GB')",
+        "units": "Units: 'metric' (Celsius) or 'imperial' (Fahrenheit), default: metric"
+    }
+
+    def __init__(self, api_key: Optional[str] = None, session: Optional[requests.Session] = None):
         """
         Initialize Weather tool
         
         Args:
             api_key: OpenWeatherMap API key
+            session: Shared pooled HTTP session (defaults to the
+                process-wide pool)
         """
         self.api_key = api_key or os.getenv("OPENWEATHER_API_KEY")
         if not self.api_key:
             # Use demo mode with limited functionality
             self.api_key = None
         self.base_url = "http://api.openweathermap.org/data/2.5"
-    
-    @property
-    def name(self) -> str:
-        return "weather"
-    
-    @property
-    def description(self) -> str:
-        return "Get current weather information and forecasts for any city"
-    
-    @property
-    def parameters(self) -> Dict[str, str]:
-        return {
-            "action": "Action to perform: 'current' or 'forecast'",
-            "city": "City name (e.g., 'London', 'New York')",
-            "country": "Country code (optional, e.g., 'US', 'GB')",
-            "units": "Units: 'metric' (Celsius) or 'imperial' (Fahrenheit), default: metric"
+        # Endpoint URLs built once; hot paths skip per-call f-string work.
+        # (The api key stays per-request: the session is shared across
+        # tools, so credentials never go on session-wide defaults.)
+        self._weather_url = f"{self.base_url}/weather"
+        self._forecast_url = f"{self.base_url}/forecast"
+        self._group_url = f"{self.base_url}/group"
+        self._endpoint_urls = {
+            "weather": self._weather_url,
+            "forecast": self._forecast_url
+        }
+        # Keep-alive session: reuses the pooled socket between successive
+        # calls instead of paying TCP+TLS setup per request. The session
+        # is shared across tools (caller-injected or the process-wide
+        # pool), so close() never owns it.
+        self._owns_session = False
+        self.session = session or get_session()
+        # aiohttp session for the async path, created lazily inside a
+        # running event loop
+        self._aio_session = None
+        # TTL response cache: (action, city, country, units) -> (expiry, result)
+        # Locked because parallel plan steps hit it from the executor's
+        # thread pool
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # (city, country) lowercase -> numeric OpenWeatherMap id, learned
+        # from single-city responses and required by the batch /group
+        # endpoint
+        self._city_ids: Dict[tuple, int] = {}
+        # (city, country) lowercase -> (lat, lon), learned from
+        # current-weather responses; coordinate lookups skip the
+        # provider's server-side geocoding on later forecast calls
+        self._city_coords: Dict[tuple, tuple] = {}
+        # Action dispatch table, built once instead of an if/elif chain
+        # re-compared on every execute call
+        self._actions = {
+            "current": self._get_current_weather,
+            "forecast": self._get_forecast,
+            "current_many": self._get_current_weather_many,
+            "bundle": self._get_weather_bundle
         }
+
+    def close(self) -> None:
+        """Release the HTTP session if this tool owns it"""
+        if self._owns_session:
+            self.session.close()
+
+    def _location_params(self, city: str, country: Optional[str], units: str) -> Dict[str, Any]:
+        """
+        Query params for a city, preferring learned coordinates
+
+        Coordinate lookups skip the provider's server-side name
+        resolution, so once a current-weather response has taught us the
+        city's lat/lon, later calls send those instead of q=city.
+        """
+        coords = self._city_coords.get(self._city_key(city, country))
+        if coords:
+            return {
+                "lat": coords[0],
+                "lon": coords[1],
+                "appid": self.api_key,
+                "units": units
+            }
+        location = f"{city},{country}" if country else city
+        return {"q": location, "appid": self.api_key, "units": units}
+
+    @staticmethod
+    def _city_key(city: str, country: Optional[str]):
+        """Build the (city, country) key used by the learned lookups"""
+        return (city.lower(), (country or "").lower())
+
+    def _learn_city(self, city: str, country: Optional[str], data: Dict[str, Any]) -> None:
+        """Record the city id and coordinates from a current-weather payload"""
+        key = self._city_key(city, country)
+        if "id" in data:
+            self._city_ids[key] = data["id"]
+        coord = data.get("coord")
+        if coord:
+            self._city_coords[key] = (coord["lat"], coord["lon"])
+
+    @staticmethod
+    def _cache_key(action: str, city: str, country: Optional[str], units: str):
+        """Build the response-cache key for a lookup"""
+        return (action, city.lower(), (country or "").lower(), units)
+
+    def _cache_get(self, key) -> Optional[Dict[str, Any]]:
+        """Get a cached response if present and not expired"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires, result = entry
+            if time.monotonic() >= expires:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return copy.deepcopy(result)
+
+    def _cache_store(self, key, result: Dict[str, Any], ttl: float) -> None:
+        """Store a response, evicting the oldest entry on overflow"""
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + ttl, copy.deepcopy(result))
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    @staticmethod
+    def _ttl_from_headers(headers, default: float) -> float:
+        """TTL from the response's Cache-Control max-age, or the default"""
+        for part in headers.get("Cache-Control", "").split(","):
+            part = part.strip()
+            if part.startswith("max-age="):
+                try:
+                    return float(part[8:])
+                except ValueError:
+                    break
+        return default
+
+    async def _aio(self):
+        """Get the lazily created aiohttp session for async calls"""
+        if self._aio_session is None or self._aio_session.closed:
+            import aiohttp
+            self._aio_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+            )
+        return self._aio_session
+
+    async def aclose(self) -> None:
+        """Close the async HTTP session"""
+        if self._aio_session is not None and not self._aio_session.closed:
+            await self._aio_session.close()
+
+    async def aexecute(self, **kwargs) -> Dict[str, Any]:
+        """
+        Async weather lookup over aiohttp
+
+        Concurrent lookups (e.g. several cities) share one connection
+        pool and overlap their round trips under asyncio.gather.
+
+        Args:
+            action: 'current' or 'forecast'
+            city: City name
+            country: Country code (optional)
+            units: 'metric' or 'imperial'
+
+        Returns:
+            Dictionary with weather data
+        """
+        if not self.api_key:
+            return self._demo_weather(**kwargs)
+
+        action = kwargs.get("action", "current")
+
+        try:
+            if action == "current":
+                return await self._aget("weather", self._parse_current, **kwargs)
+            elif action == "forecast":
+                return await self._aget("forecast", self._parse_forecast, **kwargs)
+            elif action == "bundle":
+                # Both legs overlap their round trips on the shared pool
+                current, forecast = await asyncio.gather(
+                    self._aget("weather", self._parse_current, **kwargs),
+                    self._aget("forecast", self._parse_forecast, **kwargs)
+                )
+                return {
+                    "success": (
+                        current.get("success", False)
+                        and forecast.get("success", False)
+                    ),
+                    "action": "bundle",
+                    "current": current,
+                    "forecast": forecast
+                }
+            return await super().aexecute(**kwargs)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error executing weather tool: {str(e)}"
+            }
+
+    async def _aget(self, endpoint: str, parser, **kwargs) -> Dict[str, Any]:
+        """Fetch one weather endpoint asynchronously and parse the payload"""
+        city = kwargs.get("city")
+        country = kwargs.get("country")
+        units = kwargs.get("units", "metric")
+
+        if not city:
+            return {"success": False, "error": "City parameter is required"}
+
+        action = "current" if endpoint == "weather" else endpoint
+        cache_key = self._cache_key(action, city, country, units)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        params = self._location_params(city, country, units)
+
+        session = await self._aio()
+        async with session.get(self._endpoint_urls[endpoint], params=params) as response:
+            response.raise_for_status()
+            ttl = self._ttl_from_headers(response.headers, self.CACHE_TTLS[action])
+            data = await response.json()
+
+        if action == "current":
+            self._learn_city(city, country, data)
+
+        result = parser(data, units)
+        self._cache_store(cache_key, result, ttl)
+        return result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def execute(self, **kwargs) -> Dict[str, Any]:
         """
@@ -58,23 +286,28 @@ class WeatherTool(BaseTool):
             return self._demo_weather(**kwargs)
         
         action = kwargs.get("action", "current")
-        
+
+        handler = self._actions.get(action)
+        if handler is None:
+            return {
+                "success": False,
+                "error": f"Unknown action: {action}"
+            }
+
         try:
-            if action == "current":
-                return self._get_current_weather(**kwargs)
-            elif action == "forecast":
-                return self._get_forecast(**kwargs)
-            else:
-                return {
-                    "success": False,
-                    "error": f"Unknown action: {action}"
-                }
+            return handler(**kwargs)
+        except requests.HTTPError as e:
+            return {
+                "success": False,
+                "error": f"Weather API error: {str(e)}",
+                **http_error_details(e)
+            }
         except Exception as e:
             return {
                 "success": False,
                 "error": f"Error executing weather tool: {str(e)}"
             }
-    
+
     def _get_current_weather(self, **kwargs) -> Dict[str, Any]:
         """Get current weather for a city"""
         city = kwargs.get("city")
@@ -83,26 +316,32 @@ class WeatherTool(BaseTool):
         
         if not city:
             return {"success": False, "error": "City parameter is required"}
-        
-        # Build location query
-        location = city
-        if country:
-            location = f"{city},{country}"
-        
-        # Make API request
-        params = {
-            "q": location,
-            "appid": self.api_key,
-            "units": units
-        }
-        
-        response = requests.get(f"{self.base_url}/weather", params=params)
+
+        cache_key = self._cache_key("current", city, country, units)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        params = self._location_params(city, country, units)
+
+        response = self.session.get(self._weather_url, params=params)
         response.raise_for_status()
-        data = response.json()
-        
-        # Parse response
+        data = _json_loads(response.content)
+
+        self._learn_city(city, country, data)
+
+        result = self._parse_current(data, units)
+        self._cache_store(
+            cache_key, result,
+            self._ttl_from_headers(response.headers, self.CACHE_TTLS["current"])
+        )
+        return result
+
+    @staticmethod
+    def _parse_current(data: Dict[str, Any], units: str) -> Dict[str, Any]:
+        """Map a current-weather payload onto the result schema"""
         temp_unit = "°C" if units == "metric" else "°F"
-        
+
         return {
             "success": True,
             "action": "current",
@@ -129,6 +368,90 @@ class WeatherTool(BaseTool):
             }
         }
     
+    def _get_current_weather_many(self, **kwargs) -> Dict[str, Any]:
+        """
+        Get current weather for several cities in one batch call
+
+        Cities whose numeric id is already known (learned from earlier
+        single-city lookups) are fetched with a single /group request -
+        one round trip for up to 20 cities instead of one per city.
+        Cities without a known id fall back to the single-city path,
+        which records the id for next time.
+
+        Args:
+            cities: List of city names
+            units: 'metric' or 'imperial'
+
+        Returns:
+            Dictionary mapping city names to weather results
+        """
+        cities = kwargs.get("cities") or []
+        units = kwargs.get("units", "metric")
+
+        if not cities:
+            return {"success": False, "error": "cities parameter is required"}
+
+        results: Dict[str, Any] = {}
+        # id -> requested name, so group entries come back keyed by the
+        # caller's city strings rather than the API's canonical names
+        id_to_name: Dict[int, str] = {}
+        for city in cities:
+            city_id = self._city_ids.get(self._city_key(city, None))
+            if city_id is None:
+                results[city] = self._get_current_weather(city=city, units=units)
+            else:
+                id_to_name[city_id] = city
+
+        if id_to_name:
+            response = self.session.get(
+                self._group_url,
+                params={
+                    "id": ",".join(str(city_id) for city_id in id_to_name),
+                    "units": units,
+                    "appid": self.api_key
+                }
+            )
+            response.raise_for_status()
+            data = _json_loads(response.content)
+
+            for entry in data.get("list", []):
+                name = id_to_name.get(entry.get("id"), entry["name"])
+                results[name] = self._parse_current(entry, units)
+
+        succeeded = sum(1 for r in results.values() if r.get("success", False))
+        return {
+            "success": succeeded == len(results),
+            "action": "current_many",
+            "count": succeeded,
+            "cities": results
+        }
+
+    def _get_weather_bundle(self, **kwargs) -> Dict[str, Any]:
+        """
+        Get current weather and forecast for a city in one action
+
+        Covers the common "what's the weather now and later" intent with
+        a single plan step instead of two. The current call runs first so
+        the forecast call reuses the coordinates it just learned, and
+        both legs hit the response cache independently.
+
+        Args:
+            city: City name
+            country: Country code (optional)
+            units: 'metric' or 'imperial'
+
+        Returns:
+            Dictionary with 'current' and 'forecast' results
+        """
+        current = self._get_current_weather(**kwargs)
+        forecast = self._get_forecast(**kwargs)
+        return {
+            "success": current.get("success", False) and forecast.get("success", False),
+            "action": "bundle",
+            "current": current,
+            "forecast": forecast
+        }
+
     def _get_forecast(self, **kwargs) -> Dict[str, Any]:
         """Get 5-day weather forecast for a city"""
         city = kwargs.get("city")
@@ -137,27 +460,31 @@ class WeatherTool(BaseTool):
         
         if not city:
             return {"success": False, "error": "City parameter is required"}
-        
-        # Build location query
-        location = city
-        if country:
-            location = f"{city},{country}"
-        
-        # Make API request
-        params = {
-            "q": location,
-            "appid": self.api_key,
-            "units": units
-        }
-        
-        response = requests.get(f"{self.base_url}/forecast", params=params)
+
+        cache_key = self._cache_key("forecast", city, country, units)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        params = self._location_params(city, country, units)
+
+        response = self.session.get(self._forecast_url, params=params)
         response.raise_for_status()
-        data = response.json()
-        
-        # Parse forecast data (3-hour intervals)
+        data = _json_loads(response.content)
+
+        result = self._parse_forecast(data, units)
+        self._cache_store(
+            cache_key, result,
+            self._ttl_from_headers(response.headers, self.CACHE_TTLS["forecast"])
+        )
+        return result
+
+    @staticmethod
+    def _parse_forecast(data: Dict[str, Any], units: str) -> Dict[str, Any]:
+        """Map a forecast payload onto the result schema (3-hour intervals)"""
         temp_unit = "°C" if units == "metric" else "°F"
         forecasts = []
-        
+
         for item in data["list"][:8]:  # Get next 24 hours (8 * 3-hour intervals)
             forecasts.append({
                 "datetime": item["dt_txt"],
@@ -167,7 +494,7 @@ class WeatherTool(BaseTool):
                 "humidity": item["main"]["humidity"],
                 "wind_speed": item["wind"]["speed"]
             })
-        
+
         return {
             "success": True,
             "action": "forecast",
@@ -188,7 +515,30 @@ class WeatherTool(BaseTool):
         action = kwargs.get("action", "current")
         units = kwargs.get("units", "metric")
         temp_unit = "°C" if units == "metric" else "°F"
-        
+
+        if action == "current_many":
+            cities = kwargs.get("cities") or []
+            results = {
+                name: self._demo_weather(action="current", city=name, units=units)
+                for name in cities
+            }
+            return {
+                "success": True,
+                "action": "current_many",
+                "demo_mode": True,
+                "count": len(results),
+                "cities": results
+            }
+
+        if action == "bundle":
+            return {
+                "success": True,
+                "action": "bundle",
+                "demo_mode": True,
+                "current": self._demo_weather(action="current", city=city, units=units),
+                "forecast": self._demo_weather(action="forecast", city=city, units=units)
+            }
+
         if action == "current":
             return {
                 "success": True,